@@ -4,11 +4,14 @@ from pathlib import Path
 
 from flask import Flask
 from config import Config
-from my_models import db
+from my_models import db, run_migrations
 from views.routes import init_routes
 from controllers.student_controller import student_bp
 from controllers import AdminController, BlockchainController
 from views.routes import routes
+from commands import init_commands
+from utils.chain_writer import init_chain_writer
+from utils.miner import validate_difficulty
 
 
 # Ensure current directory and root are in sys.path
@@ -19,6 +22,8 @@ sys.path.append(str(Path(__file__).parent))
 def create_app():
     app = Flask(__name__, template_folder='templates')
     app.config.from_object(Config)
+    # A bad difficulty fails here, not in the first request that mines a block
+    validate_difficulty(app.config['BLOCKCHAIN_DIFFICULTY'])
     
     # Initialize database
     db.init_app(app)
@@ -28,6 +33,8 @@ def create_app():
     init_routes(app)
     app.register_blueprint(student_bp)
     app.register_blueprint(routes)
+    init_commands(app)
+    init_chain_writer(app)
 
     # Ensure necessary directories exist
     base_dir = Path(__file__).resolve().parent
@@ -36,8 +43,10 @@ def create_app():
     # Initialize DB tables and blockchain
     with app.app_context():
             db.create_all()
+            run_migrations(db.engine)
             AdminController.initialize_admins()
             BlockchainController.initialize_blockchain()
+            BlockchainController.build_chain_index()
 
     return app
 
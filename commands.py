@@ -0,0 +1,184 @@
+import os
+import tempfile
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from controllers import BlockchainController, DegreeController
+from my_models import db, run_migrations, migration_status
+from utils.degree_import import detect_format, parse_degree_rows
+from utils.certificate_pdf import certificate_fields_bulk, default_logo_path
+from utils.certificate_export import iter_certificate_zip
+from utils.miner import benchmark
+from utils.chain_writer import run_chain_writer
+from utils.schema_bench import run_schema_benchmark
+
+chain_cli = AppGroup('chain', help='Blockchain maintenance commands.')
+degrees_cli = AppGroup('degrees', help='Degree management commands.')
+certificates_cli = AppGroup('certificates', help='Certificate commands.')
+db_cli = AppGroup('db', help='Database schema commands.')
+
+
+@chain_cli.command('validate')
+@click.option('--full', is_flag=True, help='Ignore the checkpoint and re-validate from genesis.')
+def validate_chain(full):
+    """Validate the chain incrementally from the last checkpoint."""
+    success, result = BlockchainController.validate_chain(full=full)
+    if not success:
+        raise click.ClickException(result)
+
+    checkpoint = result['checkpoint']
+    click.echo(
+        f"✅ Chain valid: checked {result['checked']} of {result['length']} blocks, "
+        f"checkpoint at block {checkpoint['index']} ({checkpoint['hash'][:12]}...)"
+    )
+
+
+@chain_cli.command('audit')
+@click.option('--workers', type=int, default=None, help='Worker processes (default: all cores).')
+@click.option('--chunk-size', type=int, default=None, help='Blocks per work unit.')
+def audit_chain(workers, chunk_size):
+    """Full parallel audit of every block hash and link."""
+    report = BlockchainController.audit_chain(workers=workers, chunk_size=chunk_size)
+    click.echo(
+        f"Audited {report['blocks']} blocks on {report['workers']} workers in "
+        f"{report['seconds']:.2f}s ({report['blocks_per_sec']:,.0f} blocks/sec)"
+    )
+    if not report['valid']:
+        raise click.ClickException(
+            f"{report['reason']} at block {report['first_bad_index']} "
+            f"(position {report['first_bad_position']})"
+        )
+    click.echo("✅ Chain valid")
+
+
+@chain_cli.command('root')
+def merkle_root():
+    """Print the Merkle root to publish (verifiers check inclusion proofs against it)."""
+    success, result = BlockchainController.get_merkle_root()
+    if not success:
+        raise click.ClickException(result)
+    click.echo(f"{result['root']}  ({result['leaf_count']} blocks)")
+
+
+@chain_cli.command('bench-miner')
+@click.option('--workers', type=int, default=None, help='Worker processes (default: MINER_WORKERS).')
+@click.option('--seconds', type=float, default=3.0, help='Duration of each measurement.')
+def bench_miner(workers, seconds):
+    """Measure proof-of-work hashes/sec, per core and across all workers."""
+    report = benchmark(workers=workers or current_app.config['MINER_WORKERS'], seconds=seconds)
+    click.echo(f"Naive re-encode, 1 core:   {report['naive_per_sec']:>14,.0f} hashes/sec")
+    click.echo(f"Pre-serialized, 1 core:    {report['single_core_per_sec']:>14,.0f} hashes/sec")
+    click.echo(f"Pre-serialized, {report['workers']} workers: {report['parallel_per_sec']:>14,.0f} hashes/sec "
+               f"({report['per_core_per_sec']:,.0f} per core)")
+
+    difficulty = current_app.config['BLOCKCHAIN_DIFFICULTY']
+    if difficulty > 0:
+        expected = 16 ** difficulty / report['parallel_per_sec']
+        click.echo(f"BLOCKCHAIN_DIFFICULTY={difficulty}: ~{expected:.2f}s per block on average")
+
+
+@chain_cli.command('writer')
+@click.option('--once', is_flag=True, help='Drain the queue and exit instead of running until stopped.')
+def chain_writer(once):
+    """Run the chain writer as its own process (set CHAIN_WRITER_THREAD=false for the web workers)."""
+    processed = run_chain_writer(current_app._get_current_object(), once=once)
+    click.echo(f"✅ Processed {processed} queued append(s)")
+
+
+@chain_cli.command('queue')
+def chain_queue():
+    """Show the chain append queue: blocks queued, waiting, appended and failed."""
+    counts = BlockchainController.get_chain_append_counts()
+    for status in ('queued', 'waiting', 'appended', 'failed'):
+        click.echo(f"{status:>9}: {counts.get(status, 0)}")
+
+
+@degrees_cli.command('import')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+              help='Input format (default: from the file extension).')
+@click.option('--batch-size', type=int, default=None, help='Rows flushed per batch.')
+def import_degrees(source, fmt, batch_size):
+    """Bulk import degrees (and missing students) from CSV or JSON lines."""
+    fmt = fmt or detect_format(source.name)
+    success, result = DegreeController.bulk_import(
+        parse_degree_rows(source, fmt),
+        batch_size=batch_size or current_app.config['BULK_IMPORT_BATCH_SIZE']
+    )
+    if not success:
+        raise click.ClickException(result)
+
+    click.echo(f"✅ Imported {result['degrees_created']} degrees, created {result['students_created']} students")
+    for skipped in result['skipped']:
+        click.echo(f"  line {skipped['line']}: {skipped['error']}", err=True)
+
+
+@certificates_cli.command('export')
+@click.argument('output', type=click.File('wb'))
+@click.option('--institution', default=None)
+@click.option('--year-awarded', type=int, default=None)
+@click.option('--field-of-study', default=None)
+@click.option('--workers', type=int, default=None, help='Render processes (default: CERT_EXPORT_WORKERS).')
+def export_certificates(output, institution, year_awarded, field_of_study, workers):
+    """Write a ZIP of approved certificates for a cohort."""
+    degrees = DegreeController.get_approved_degrees(
+        institution=institution, year_awarded=year_awarded, field_of_study=field_of_study
+    )
+    if not degrees:
+        raise click.ClickException("No approved certificates match this filter")
+
+    chunks = iter_certificate_zip(
+        certificate_fields_bulk(degrees),
+        default_logo_path(),
+        workers or current_app.config['CERT_EXPORT_WORKERS']
+    )
+    for chunk in chunks:
+        output.write(chunk)
+    click.echo(f"✅ Exported {len(degrees)} certificates to {output.name}")
+
+
+@db_cli.command('migrate')
+def migrate():
+    """Apply pending schema migrations (also done at startup)."""
+    applied = run_migrations(db.engine)
+    click.echo(f"✅ Applied {len(applied)} migration(s)" if applied else "✅ Schema up to date")
+
+
+@db_cli.command('status')
+def migrations_status():
+    """List schema migrations and whether each is applied."""
+    for version, name, applied in migration_status(db.engine):
+        click.echo(f"{version:04d} {name:<30} {'applied' if applied else 'pending'}")
+
+
+@db_cli.command('bench')
+@click.option('--database-url', default=None,
+              help='Scratch database to seed; all its tables are dropped (default: a SQLite file in the temp dir).')
+@click.option('--degrees', type=int, default=1_000_000, help='Degrees (and blocks) to seed.')
+@click.option('--repeat', type=int, default=20, help='Runs of each query per measurement.')
+def bench_schema(database_url, degrees, repeat):
+    """Query plans and timings of the hot lookups, before and after the index migration."""
+    database_url = database_url or 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'degree_schema_bench.db')
+    if database_url == current_app.config['SQLALCHEMY_DATABASE_URI']:
+        raise click.ClickException("Refusing to drop the application database; pass a scratch --database-url")
+
+    click.echo(f"Seeding {degrees:,} degrees into {database_url} ...")
+    report = run_schema_benchmark(database_url, degrees=degrees, repeat=repeat)
+    click.echo(f"Seeded in {report['seed_seconds']:.1f}s, migrated in {report['migrate_seconds']:.1f}s "
+               f"({report['dialect']})\n")
+
+    for query in report['queries']:
+        before, after = query['before'], query['after']
+        click.echo(f"{query['name']} ({query['table']}): {before['ms']:.3f} ms -> {after['ms']:.3f} ms "
+                   f"({before['ms'] / max(after['ms'], 1e-6):,.0f}x)")
+        click.echo(f"  before: {' | '.join(before['plan'])}")
+        click.echo(f"  after:  {' | '.join(after['plan'])}")
+
+
+def init_commands(app):
+    app.cli.add_command(chain_cli)
+    app.cli.add_command(degrees_cli)
+    app.cli.add_command(certificates_cli)
+    app.cli.add_command(db_cli)
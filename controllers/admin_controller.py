@@ -1,5 +1,6 @@
 from my_models import db, Admin
 from utils.crypto import generate_key_pair
+from utils.entity_cache import cached_admin
 from werkzeug.security import generate_password_hash
 
 class AdminController:
@@ -34,7 +35,7 @@ class AdminController:
     
     @staticmethod
     def get_admin(admin_id):
-        admin = Admin.query.get(admin_id)
+        admin = cached_admin(admin_id)
         if not admin:
             return False, "Admin not found"
         
@@ -45,6 +46,50 @@ class AdminController:
         from my_models import Block
         return Block.query.filter_by(approved=False).order_by(Block.timestamp.desc()).all()
     
+    @staticmethod
+    def get_dashboard_data(admin_id, page=1, per_page=50):
+        """
+        One page of pending blocks with everything the dashboard shows.
+        Query count is fixed per page (page + pagination count, students,
+        this admin's approvals), however many blocks are pending; approval
+        counts come from each block's approval_count column.
+        """
+        from sqlalchemy.orm import contains_eager
+        from my_models import Block, Degree, Student, Approval
+
+        pagination = (
+            Block.query
+            .join(Degree, Block.degree_id == Degree.id)
+            .options(contains_eager(Block.degree))
+            .filter(Block.approved.is_(False))
+            .order_by(Block.timestamp.desc(), Block.id.desc())
+            .paginate(page=page, per_page=per_page, error_out=False)
+        )
+        blocks = pagination.items
+        block_ids = [b.id for b in blocks]
+        student_ids = {b.degree.student_id for b in blocks}
+
+        students = {
+            s.student_id: s for s in Student.query.filter(Student.student_id.in_(student_ids)).all()
+        } if student_ids else {}
+
+        approval_counts = {b.id: b.approval_count for b in blocks}
+
+        approved_block_ids = {
+            block_id for (block_id,) in db.session.query(Approval.block_id)
+            .filter(Approval.admin_id == admin_id,
+                    Approval.block_id.in_(block_ids),
+                    Approval.approval_status.is_(True))
+        } if block_ids else set()
+
+        return {
+            'pending_blocks': blocks,
+            'pagination': pagination,
+            'students': students,
+            'approval_counts': approval_counts,
+            'approved_block_ids': approved_block_ids
+        }
+
     @staticmethod
     def get_admin_approvals(admin_id):
         from my_models import Approval
@@ -1,4 +1,6 @@
-from my_models import db, Block, Degree, Approval, Admin, Student
+from my_models import db, Block, Degree, Approval, Admin, Student, ChainAppend
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
 from utils.blockchain_utils import BlockchainUtils
 from utils.crypto import calculate_hash
 from datetime import datetime
@@ -8,12 +10,52 @@ from my_models import Student
 from flask import current_app
 import os
 from utils.blockchain_utils import utcnow_iso, format_timestamp
+from utils.chain_index import chain_index
+from utils.chain_store import get_chain_store
+from utils.chain_reader import get_chain_reader
+from utils.chain_validator import IncrementalValidator
+from utils.chain_audit import audit_chain
+from utils.merkle import get_chain_mmr
+from utils.miner import mine
+from utils.certificate_jobs import schedule_prerender
+from utils.chain_writer import notify_chain_writer
+from utils.entity_cache import cached_admin
 
 def utcnow_iso():
     return datetime.utcnow().replace(microsecond=0).isoformat()
 
 class BlockchainController:
     VALID_ADMIN_USERNAMES = ['admin1', 'admin2', 'admin3']
+    REQUIRED_APPROVALS = 3
+
+    @staticmethod
+    def count_approval(block_id):
+        """
+        Add one positive approval to the block's counter and return the new value.
+        A single UPDATE ... RETURNING: concurrent approvals each get a distinct
+        count, so exactly one of them sees REQUIRED_APPROVALS.
+        """
+        return db.session.execute(
+            update(Block)
+            .where(Block.id == block_id)
+            .values(approval_count=Block.approval_count + 1)
+            .returning(Block.approval_count)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+
+    @staticmethod
+    def count_approvals(block_ids):
+        """count_approval for many blocks in one statement; returns {block_id: new count}."""
+        if not block_ids:
+            return {}
+        return dict(db.session.execute(
+            update(Block)
+            .where(Block.id.in_(block_ids))
+            .values(approval_count=Block.approval_count + 1)
+            .returning(Block.id, Block.approval_count)
+            .execution_options(synchronize_session=False)
+        ).all())
+
     @staticmethod
     def initialize_blockchain():
     # 🔧 Set up file path
@@ -23,8 +65,15 @@ class BlockchainController:
             json_path = os.path.join(base_dir, 'data', 'blockchain.json')
         os.makedirs(os.path.dirname(json_path), exist_ok=True)
 
+        store = get_chain_store()
+
     # ✅ First, check DB: if already initialized, skip
         if Block.query.count() > 0:
+            # One-time migration: seed the append-only store from the legacy blockchain.json
+            if len(store) == 0 and os.path.exists(json_path):
+                imported = store.import_json(json_path)
+                if imported:
+                    print(f"📦 Imported {len(imported)} blocks from blockchain.json into chain storage.")
             print("🔁 Blockchain already initialized in database.")
             return
 
@@ -77,11 +126,35 @@ class BlockchainController:
         db.session.add(genesis_block)
         db.session.commit()
 
-    # Save same block to JSON file
-        with open(json_path, 'w') as f:
-            json.dump([block_obj], f, indent=4)
+    # Save same block to chain storage (fresh DB means a fresh chain), swapped in atomically
+        store.reset([block_obj])
+
+        print("✅ Genesis block added to DB + chain storage (consistent).")
 
-        print("✅ Genesis block added to DB + JSON (consistent).")
+    @staticmethod
+    def build_chain_index():
+        """Load the chain store into the in-process index and catch the Merkle range up (once, at startup)"""
+        try:
+            store = get_chain_store()
+            chain_index.build(store)
+            get_chain_mmr(store).sync(store)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Chain index not built: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _degree_data(degree):
+        """Degree payload exactly as it is hashed into a block"""
+        return {
+            'id': int(degree.id),
+            'student_id': str(degree.student_id),
+            'degree_name': degree.degree_name,
+            'institution': degree.institution,
+            'year_awarded': int(degree.year_awarded),
+            'field_of_study': degree.field_of_study,
+            'created_at': format_timestamp(degree.created_at)
+        }
 
     @staticmethod
     def add_degree_to_blockchain(degree_id):
@@ -98,15 +171,7 @@ class BlockchainController:
             return False, "Blockchain not initialized"
 
         # Prepare degree data
-        degree_data = {
-            'id': int(degree.id),
-            'student_id': str(degree.student_id),
-            'degree_name': degree.degree_name,
-            'institution': degree.institution,
-            'year_awarded': int(degree.year_awarded),
-            'field_of_study': degree.field_of_study,
-            'created_at': format_timestamp(degree.created_at)
-        }
+        degree_data = BlockchainController._degree_data(degree)
         ts = utcnow_iso()
 
         index = int(last_block.id) + 1
@@ -134,6 +199,45 @@ class BlockchainController:
 
         return True, "Degree added to blockchain pending approval"
 
+    @staticmethod
+    def add_degrees_to_blockchain(degrees, previous_hash):
+        """
+        Pending blocks for a batch of flushed degrees, hash-chained in order from `previous_hash`.
+        Runs inside the caller's transaction (flush only, no commit); returns the last block hash.
+        """
+        ts = datetime.utcnow().replace(microsecond=0)
+        blocks = [
+            Block(
+                previous_hash=previous_hash,
+                current_hash='',  # filled in once the DB id (the block index) is known
+                degree_id=degree.id,
+                timestamp=ts,
+                nonce=0,
+                approved=False
+            )
+            for degree in degrees
+        ]
+        db.session.add_all(blocks)
+        db.session.flush()
+
+        for degree, block in zip(degrees, blocks):
+            degree_data = BlockchainController._degree_data(degree)
+            # each block's work depends on the previous hash, so blocks are mined in order
+            nonce, _ = mine(block.id, previous_hash, format_timestamp(ts), degree_data)
+            block_data = BlockchainUtils.build_block(
+                index=block.id,
+                previous_hash=previous_hash,
+                timestamp=ts,
+                data=degree_data,
+                nonce=nonce
+            )
+            block.nonce = block_data['nonce']
+            block.previous_hash = block_data['previous_hash']
+            block.current_hash = block_data['hash']
+            previous_hash = block.current_hash
+
+        return previous_hash
+
     @staticmethod
     def approve_block(block_id, admin_id):
         """Process block approval by admin"""
@@ -141,7 +245,7 @@ class BlockchainController:
         if not block:
             return False, "Block not found"
 
-        admin = Admin.query.get(admin_id)
+        admin = cached_admin(admin_id)
         if not admin:
             return False, "Admin not found"
 
@@ -153,144 +257,358 @@ class BlockchainController:
         new_approval = Approval(
             block_id=block_id,
             admin_id=admin_id,
+            degree_id=block.degree_id,
             approval_status=True
         )
         db.session.add(new_approval)
-
-        # Check for 3 approvals
-        approval_count = Approval.query.filter_by(
-            block_id=block_id,
-            approval_status=True
-        ).count()
-
-        if approval_count >= 3:
+        try:
+            db.session.flush()  # the unique (block, admin) index catches a concurrent duplicate
+        except IntegrityError as e:
+            db.session.rollback()
+            if Approval.is_duplicate_error(e):
+                return False, "Admin already approved this block"
+            return False, f"Approval not recorded: {e.orig}"
+
+        # Only the approval that takes the counter to 3 finalizes the block
+        if BlockchainController.count_approval(block_id) == BlockchainController.REQUIRED_APPROVALS:
             # ✅ Validate that all approvals are from valid admins
             all_approvals = Approval.query.filter_by(block_id=block_id, approval_status=True).all()
             for approval in all_approvals:
-                approving_admin = Admin.query.get(approval.admin_id)
+                approving_admin = cached_admin(approval.admin_id)
                 if approving_admin.username not in BlockchainController.VALID_ADMIN_USERNAMES:
+                    db.session.rollback()
                     return False, f"Unauthorized admin '{approving_admin.username}' detected. Rejecting block."
 
             block.approved = True
-
-            # Ensure blockchain integrity before adding
-            if not BlockchainController._is_valid_chain_addition(block):
-                return False, "Chain integrity invalid. Block not added."
-
-            BlockchainController._add_to_json_blockchain(block)
+            BlockchainController._queue_chain_appends([block])
             db.session.commit()
-            return True, "Degree fully approved and added to blockchain"
+            # The chain writer checks linkage and appends it off the request path
+            notify_chain_writer()
+            return True, "Degree fully approved; queued for the blockchain"
 
         db.session.commit()
         return True, "Approval recorded (awaiting more approvals)"
 
     @staticmethod
-    def _is_valid_chain_addition(block):
-        """Check if new block correctly extends the chain"""
-        try:
-            with open(current_app.config['JSON_STORAGE_PATH'], 'r') as f:
-                chain = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return False
+    def approve_blocks(block_ids, admin_id):
+        """
+        Batch approval by one admin.
+        - All Approval rows are recorded in one transaction.
+        - One UPDATE ... RETURNING bumps every touched block's approval
+          counter; the blocks it takes to 3 are final.
+        - Every block that became final is queued for the chain writer in the
+          same transaction; the request does not wait for the append.
+        Returns (success, {block_id: message}).
+        """
+        block_ids = sorted({int(b) for b in block_ids})
+        if not block_ids:
+            return False, "No blocks given"
+
+        admin = cached_admin(admin_id)
+        if not admin:
+            return False, "Admin not found"
 
-        if not chain:
-            return False
+        results = {}
+        blocks = {b.id: b for b in Block.query.filter(Block.id.in_(block_ids)).all()}
+        already = {
+            block_id for (block_id,) in db.session.query(Approval.block_id)
+            .filter(Approval.admin_id == admin_id, Approval.block_id.in_(block_ids))
+        }
 
-        last_block = chain[-1]
-        return block.previous_hash == last_block['hash']
-    @staticmethod
-    def _add_to_json_blockchain(block):
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-        blockchain_file = os.path.join(base_dir, 'data', 'blockchain.json')
+        for block_id in block_ids:
+            block = blocks.get(block_id)
+            if not block:
+                results[block_id] = "Block not found"
+            elif block.approved:
+                results[block_id] = "Block already approved"
+            elif block_id in already:
+                results[block_id] = "Admin already approved this block"
+            else:
+                db.session.add(Approval(
+                    block_id=block_id,
+                    admin_id=admin_id,
+                    degree_id=block.degree_id,
+                    approval_status=True
+                ))
+                results[block_id] = "Approval recorded (awaiting more approvals)"
+        try:
+            db.session.flush()
+        except IntegrityError as e:
+            db.session.rollback()
+            if Approval.is_duplicate_error(e):
+                # the same admin approved one of these blocks in another request meanwhile
+                return False, "Concurrent approval by this admin; nothing recorded, please retry"
+            return False, f"Approvals not recorded: {e.orig}"
+
+        # ✅ Which of the touched blocks this batch took to 3 approvals (one atomic update)
+        recorded = [b for b, msg in results.items() if msg.startswith("Approval recorded")]
+        final_ids = [
+            block_id for block_id, count in BlockchainController.count_approvals(recorded).items()
+            if count == BlockchainController.REQUIRED_APPROVALS
+        ]
+
+        if final_ids:
+            # ✅ Validate that all approvals are from valid admins (one join for all blocks)
+            unauthorized = {
+                block_id: username for block_id, username in db.session.query(Approval.block_id, Admin.username)
+                .join(Admin, Admin.id == Approval.admin_id)
+                .filter(Approval.block_id.in_(final_ids), Approval.approval_status.is_(True))
+                .filter(Admin.username.notin_(BlockchainController.VALID_ADMIN_USERNAMES))
+            }
+            degrees = {d.id: d for d in Degree.query.filter(
+                Degree.id.in_([blocks[b].degree_id for b in final_ids])).all()}
+
+            final_blocks = []
+            for block_id in sorted(final_ids):
+                block = blocks[block_id]
+                if block_id in unauthorized:
+                    results[block_id] = f"Unauthorized admin '{unauthorized[block_id]}' detected. Rejecting block."
+                elif block.degree_id not in degrees:
+                    results[block_id] = "Degree not found"
+                else:
+                    block.approved = True
+                    degrees[block.degree_id].status = 'Approved'
+                    final_blocks.append(block)
+                    results[block_id] = "Degree fully approved; queued for the blockchain"
+
+            BlockchainController._queue_chain_appends(final_blocks)
 
-        degree = Degree.query.get(block.degree_id)
-        if not degree:
-            print(f"❌ Degree not found for ID: {block.degree_id}")
-            return
+        db.session.commit()
+        notify_chain_writer()
+        return True, results
 
-        # Load existing chain
-        if os.path.exists(blockchain_file):
-            with open(blockchain_file, 'r') as f:
-                blockchain = json.load(f)
-        else:
-            blockchain = []
+    @staticmethod
+    def _build_chain_block(block, degree):
+        """Chain (JSON) form of a DB block, rebuilt from the DB row + its degree"""
+        return BlockchainUtils.build_block(
+            index=int(block.id),                        # 🔑 use DB id (same as in calculate_hash)
+            previous_hash=str(block.previous_hash),     # 🔑 take from DB, not len(chain)
+            timestamp=format_timestamp(block.timestamp),
+            data=BlockchainController._degree_data(degree),
+            nonce=int(block.nonce)
+        )
 
-        index = int(block.id)                       # 🔑 use DB id (same as in calculate_hash)
-        previous_hash = str(block.previous_hash)    # 🔑 take from DB, not len(chain)
-        ts = format_timestamp(block.timestamp)
+    @staticmethod
+    def _append_to_chain(chain_blocks):
+        """Append already-built chain blocks in one storage write, then index + validate them; returns their positions"""
+        if not chain_blocks:
+            return []
+
+        # Append-only: fsync'd lines, no rewrite of earlier blocks
+        store = get_chain_store()
+        positions = store.append_many(chain_blocks)
+        for chain_block, position in zip(chain_blocks, positions):
+            chain_index.add(chain_block, position, store)
+        # New leaves + their parent nodes only; earlier nodes never change
+        get_chain_mmr(store).sync(store)
+
+        print(f"✅ {len(chain_blocks)} block(s) successfully written to chain storage")
+
+        # Only the blocks after the last checkpoint get re-hashed here
+        valid, result = BlockchainController.validate_chain()
+        if not valid:
+            print(f"❌ Chain validation failed after append: {result}")
+        return positions
 
-        degree_data = {
-            'id': int(degree.id),
-            'student_id': str(degree.student_id),
-            'degree_name': degree.degree_name,
-            'institution': degree.institution,
-            'year_awarded': int(degree.year_awarded),
-            'field_of_study': degree.field_of_study,
-            'created_at': format_timestamp(degree.created_at)
-       }
+    @staticmethod
+    def _queue_chain_appends(blocks, check_linkage=True):
+        """Queue finalized blocks for the chain writer, in the caller's transaction (commit, then notify_chain_writer)"""
+        for block in blocks:
+            db.session.add(ChainAppend(block_id=block.id, check_linkage=check_linkage))
 
-        new_block = BlockchainUtils.build_block(
-            index=index,
-            previous_hash=previous_hash,
-            timestamp=ts,
-            data=degree_data,
-            nonce=int(block.nonce)
-        )
+    @staticmethod
+    def _unlinkable_reason(block):
+        """
+        Why a block that does not extend the tip never will, or None if it
+        may still (its predecessor is not on the chain yet).
+        """
+        if chain_index.lookup(block.previous_hash) is not None:
+            return "Chain integrity invalid. Another block already follows its predecessor."
+        previous = Block.query.filter_by(current_hash=block.previous_hash).first()
+        if not previous:
+            return "Chain integrity invalid. Previous block not found."
+        if previous.degree and previous.degree.status == 'Rejected':
+            return f"Chain integrity invalid. Previous block {previous.id} was rejected."
+        if previous.chain_append and previous.chain_append.status == ChainAppend.FAILED:
+            return f"Chain integrity invalid. Previous block {previous.id} failed to append."
+        return None
 
+    @staticmethod
+    def process_chain_appends(limit=100):
+        """
+        Chain writer step: append up to `limit` queued blocks, in block order.
+        Only ever called by the process holding the writer lock (utils.chain_writer).
+        - A block already in chain storage (appended before a crash, status
+          not yet recorded) is marked appended, never written twice.
+        - With check_linkage, a block that does not extend the tip waits
+          until its predecessor is appended, or fails if it never can.
+        Returns the number of queue rows settled (appended or failed).
+        """
+        # Waiting rows are re-checked every step: a block queued since may have advanced the tip
+        jobs = (ChainAppend.query.filter_by(status=ChainAppend.QUEUED)
+                .order_by(ChainAppend.block_id).limit(limit).all())
+        jobs += ChainAppend.query.filter_by(status=ChainAppend.WAITING).all()
+        if not jobs:
+            return 0
+        jobs.sort(key=lambda job: job.block_id)
+
+        store = get_chain_store()
+        chain_index.refresh(store)
+        tip = store.tip()
+        expected_previous = tip['hash'] if tip else None
+        now = datetime.utcnow()
+
+        chain_blocks, appending, settled = [], [], 0
+        for job in jobs:
+            block = job.block
+            position = chain_index.lookup(block.current_hash)
+            if position is not None:
+                job.status, job.position, job.error, job.finished_at = ChainAppend.APPENDED, position, None, now
+                settled += 1
+            elif not block.degree:
+                job.status, job.error, job.finished_at = ChainAppend.FAILED, "Degree not found", now
+                settled += 1
+            elif job.check_linkage and block.previous_hash != expected_previous:
+                reason = BlockchainController._unlinkable_reason(block)
+                if reason:
+                    job.status, job.error, job.finished_at = ChainAppend.FAILED, reason, now
+                    settled += 1
+                else:
+                    job.status = ChainAppend.WAITING
+                    job.error = "Waiting for the previous block to be appended."
+            else:
+                chain_blocks.append(BlockchainController._build_chain_block(block, block.degree))
+                appending.append(job)
+                expected_previous = block.current_hash
+
+        positions = BlockchainController._append_to_chain(chain_blocks)
+        for job, position in zip(appending, positions):
+            job.status, job.position, job.error, job.finished_at = ChainAppend.APPENDED, position, None, now
+        db.session.commit()
 
-        blockchain.append(new_block)
+        # Certificate content is fixed now: render it off the request path
+        schedule_prerender([job.block.degree_id for job in appending])
+        return settled + len(appending)
 
-        with open(blockchain_file, 'w') as f:
-            json.dump(blockchain, f, indent=4)
+    @staticmethod
+    def get_chain_append_status(block_id):
+        """Where a finalized block is in the append pipeline: queued, appended (with position) or failed."""
+        job = ChainAppend.query.filter_by(block_id=block_id).first()
+        if not job:
+            return False, "Block has not been queued for the blockchain"
+        return True, job.to_dict()
 
-        print("✅ Block successfully written to blockchain.json")
+    @staticmethod
+    def get_chain_append_counts():
+        """Number of queue rows per status."""
+        return dict(db.session.query(ChainAppend.status, func.count(ChainAppend.id)).group_by(ChainAppend.status))
 
+    @staticmethod
+    def get_stuck_chain_appends(limit=20):
+        """Approved blocks that have not reached chain storage (failed or waiting), newest first, for the admin dashboard."""
+        return (ChainAppend.query
+                .filter(ChainAppend.status.in_([ChainAppend.FAILED, ChainAppend.WAITING]))
+                .order_by(ChainAppend.block_id.desc()).limit(limit).all())
 
     @staticmethod
     def verify_degree(identifier):
-        blockchain_file = current_app.config['JSON_STORAGE_PATH']
+        store = get_chain_store()
 
-        if not os.path.exists(blockchain_file):
+        if len(store) == 0:
             return False, "Blockchain not initialized or missing."
 
-        with open(blockchain_file, 'r') as f:
+        # Only reads blocks appended by other workers since the last refresh
+        try:
+            chain_index.refresh(store)
+
+            # Either search by hash or by degree id, then decode just that block
+            position = chain_index.lookup(identifier)
+            if position is None:
+                return False, "Hash or Degree ID not found in blockchain."
+            block = get_chain_reader(store).block(position)
+        except (OSError, ValueError, IndexError):  # IndexError: the store was reset meanwhile
+            return False, "Blockchain file corrupted."
+
+        return BlockchainController._check_chain_block(block)
+
+    @staticmethod
+    def verify_degrees(identifiers, with_proofs=False):
+        """
+        Batch form of verify_degree for API clients.
+        The index is refreshed and the reader opened once for the whole batch;
+        every identifier gets its own result, so one tampered or unknown entry
+        does not fail the others. with_proofs adds a Merkle inclusion proof
+        to every verified item, all against the same root.
+        """
+        store = get_chain_store()
+
+        if len(store) == 0:
+            return False, "Blockchain not initialized or missing."
+
+        try:
+            chain_index.refresh(store)
+            reader = get_chain_reader(store)
+            mmr = get_chain_mmr(store) if with_proofs else None
+            if mmr:
+                mmr.sync(store)
+                leaf_count = mmr.leaf_count()
+        except (OSError, ValueError):
+            return False, "Blockchain file corrupted."
+
+        results = []
+        for identifier in identifiers:
+            identifier = str(identifier).strip()
+            position = chain_index.lookup(identifier)
+            if position is None:
+                results.append({'identifier': identifier, 'verified': False, 'status': 'not_found',
+                                'message': "Hash or Degree ID not found in blockchain."})
+                continue
+
             try:
-                blockchain = json.load(f)
-            except json.JSONDecodeError:
-                return False, "Blockchain file corrupted."
-   
-        for block in blockchain:
-        # Either search by hash or by degree id (convert string to int if needed)
-            if block['hash'] == identifier or str(block['data'].get('id')) == identifier:
-            # ✅ Recalculate the hash to check tampering
-                sorted_data = json.loads(json.dumps(block['data'], sort_keys=True))
-
-                recalculated_hash = calculate_hash(
-                    block['index'],
-                    block['previous_hash'],
-                    block['timestamp'],
-                    sorted_data,
-                    block['nonce']
-                )
-
-                if recalculated_hash != block['hash']:
-                     return False, "Block has been tampered with and is invalid"
-
-            # ✅ Pull the correct values to display
-                return True, {
-                    'degree_id': block['data'].get('id'),
-                    'student_id': block['data'].get('student_id'),
-                    'degree_name': block['data'].get('degree_name'),
-                    'institution': block['data'].get('institution'),
-                    'year_awarded': block['data'].get('year_awarded'),
-                    'verification_hash': block['hash'],
-                    'timestamp': block['timestamp'],
-                    'block_index': block['index']
-                }
-
-        return False, "Hash or Degree ID not found in blockchain."
-   
+                block = reader.block(position)
+            except ValueError:
+                results.append({'identifier': identifier, 'verified': False, 'status': 'corrupted',
+                                'message': "Blockchain file corrupted."})
+                continue
+
+            success, result = BlockchainController._check_chain_block(block)
+            if success:
+                item = {'identifier': identifier, 'verified': True, 'status': 'verified', 'result': result}
+                if mmr and position < leaf_count:
+                    item['proof'] = mmr.proof(position, block['hash'], leaf_count=leaf_count)
+                results.append(item)
+            else:
+                results.append({'identifier': identifier, 'verified': False, 'status': 'tampered',
+                                'message': result})
+
+        return True, results
 
+    @staticmethod
+    def _check_chain_block(block):
+        """Tamper check for one decoded chain block; returns (success, result/message)."""
+        # ✅ Recalculate the hash to check tampering
+        recalculated_hash = calculate_hash(
+            block['index'],
+            block['previous_hash'],
+            block['timestamp'],
+            block['data'],
+            block['nonce']
+        )
+
+        if recalculated_hash != block['hash']:
+            return False, "Block has been tampered with and is invalid"
+
+        # ✅ Pull the correct values to display
+        return True, {
+            'degree_id': block['data'].get('id'),
+            'student_id': block['data'].get('student_id'),
+            'degree_name': block['data'].get('degree_name'),
+            'institution': block['data'].get('institution'),
+            'year_awarded': block['data'].get('year_awarded'),
+            'verification_hash': block['hash'],
+            'timestamp': block['timestamp'],
+            'block_index': block['index']
+        }
 
     @staticmethod
     def _verify_by_degree_id(degree_id):
@@ -308,43 +626,27 @@ class BlockchainController:
 
     @staticmethod
     def _get_verification_result(block):
+        store = get_chain_store()
         try:
-            with open(current_app.config['JSON_STORAGE_PATH'], 'r') as f:
-                blockchain = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            chain_index.refresh(store)
+            position = chain_index.lookup(block.current_hash)
+            reader = get_chain_reader(store)
+            block_data = reader.block(position) if position is not None else None
+        except (OSError, ValueError):
             return False, "Blockchain data file corrupted"
 
-        block_data = next((b for b in blockchain if isinstance(b, dict) and b.get('hash') == block.current_hash), None)
         if not block_data:
             return False, "Degree not found in blockchain records"
 
         degree = block.degree
         if not degree:
             return False, "Degree details not found"
-       # 🔄 Ensure consistent ordering for hashing
-        sorted_data = json.loads(json.dumps(block_data['data'], sort_keys=True))
+        # 🔄 Re-hash the stored canonical bytes straight from the mapping
+        untampered = reader.verify(position)
 
-        recalculated_hash = calculate_hash(
-            block_data['index'],
-            block_data['previous_hash'],
-            block_data['timestamp'],
-            sorted_data,
-            block_data['nonce']
-        )
+        current_app.logger.debug("Verification of block %s: hash matches=%s", block_data['index'], untampered)
 
-        print("🔎 VERIFICATION DEBUG")
-        print("🧩 Sorted data used for hash:", sorted_data)
-        print("Recalculated Hash:", recalculated_hash)
-        print("Index:           ", block_data['index'])
-        print("Previous Hash:   ", block_data['previous_hash'])
-        print("Data:            ", block_data['data'])
-        print("Timestamp:       ", block_data['timestamp'])
-        print("Nonce:           ", block_data['nonce'])
-        print("📦 BLOCK FROM JSON")
-        print(json.dumps(block_data, indent=2))
-
- 
-        if recalculated_hash != block_data['hash']:
+        if not untampered:
             return False, "Block has been tampered with and is invalid"
 
         # ✅ Only use data from block_data['data'] (not from DB)
@@ -373,14 +675,122 @@ class BlockchainController:
         except (KeyError, IndexError):
             return False
 
+    @staticmethod
+    def validate_chain(full=False):
+        """Validate blocks appended since the last checkpoint (or everything with full=True)"""
+        try:
+            return IncrementalValidator(get_chain_store()).run(full=full)
+        except (OSError, ValueError) as e:
+            return False, f"Blockchain storage unreadable: {e}"
+
+    @staticmethod
+    def audit_chain(workers=None, chunk_size=None):
+        """Full re-hash of every block across a process pool; returns the audit report"""
+        return audit_chain(get_chain_store(), workers=workers, chunk_size=chunk_size)
+
     @staticmethod
     def get_blockchain():
         try:
-            with open(current_app.config['JSON_STORAGE_PATH'], 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return [BlockchainUtils.create_genesis_block()]
+            chain = [block for _, block in get_chain_reader().iter_blocks()]
+        except (OSError, ValueError):
+            chain = []
+        return chain or [BlockchainUtils.create_genesis_block()]
 
     @staticmethod
-    def get_blockchain_blocks():
-        return Block.query.order_by(Block.id).all()
\ No newline at end of file
+    def get_blockchain_page(after=None, before=None, limit=20):
+        """
+        One page of the chain for the explorer, keyed by store position
+        (block indexes are not in append order: blocks are approved out of order).
+        - `after`: blocks stored after this position (next page).
+        - `before`: the `limit` blocks stored just before this position (previous page).
+        Only the blocks on the page are decoded, whatever the chain length.
+        """
+        try:
+            reader = get_chain_reader()
+            total = len(reader)
+            if before is not None:
+                stop = min(max(before, 0), total)
+                start = max(0, stop - limit)
+            else:
+                start = min(max(after + 1, 0), total) if after is not None else 0
+                stop = min(start + limit, total)
+            blocks = [block for _, block in reader.iter_blocks(start, stop)]
+        except (OSError, ValueError):
+            total, start, stop, blocks = 0, 0, 0, []
+
+        if not blocks and total == 0:
+            blocks = [BlockchainUtils.create_genesis_block()]
+
+        return {
+            'blocks': blocks,
+            'total': total,
+            'prev_before': start if blocks and start > 0 else None,
+            'next_after': stop - 1 if blocks and stop < total else None
+        }
+
+    @staticmethod
+    def get_merkle_root():
+        """Current published root over every block hash, with the number of blocks it covers."""
+        store = get_chain_store()
+        try:
+            mmr = get_chain_mmr(store)
+            leaf_count = mmr.sync(store)
+            return True, {'root': mmr.root(leaf_count), 'leaf_count': leaf_count}
+        except (OSError, ValueError) as e:
+            return False, f"Merkle root unavailable: {e}"
+
+    @staticmethod
+    def get_inclusion_proof(identifier, leaf_count=None):
+        """
+        O(log n) proof that a block (by hash or degree id) is in the chain.
+        Checked offline with utils.merkle.verify_inclusion against the root
+        from get_merkle_root(), or against an older root via `leaf_count`.
+        """
+        store = get_chain_store()
+        try:
+            chain_index.refresh(store)
+            position = chain_index.lookup(identifier)
+            if position is None:
+                return False, "Hash or Degree ID not found in blockchain."
+
+            mmr = get_chain_mmr(store)
+            total = mmr.sync(store)
+            if leaf_count is None:
+                leaf_count = total
+            if not position < leaf_count <= total:
+                return False, f"leaf_count must be between {position + 1} and {total}"
+
+            block_hash = get_chain_reader(store).stored_hash(position)
+            return True, mmr.proof(position, block_hash, leaf_count=leaf_count)
+        except (OSError, ValueError):
+            return False, "Blockchain file corrupted."
+
+    @staticmethod
+    def get_chain_snapshot():
+        """Read-only view of the chain as stored right now (later appends are not seen)."""
+        return get_chain_reader()
+
+    @staticmethod
+    def get_chain_block(block_hash):
+        """
+        One block by its hash, for the per-block explorer view.
+        Returns (True, {'block', 'position', 'valid'}) or (False, message);
+        'valid' is the result of re-hashing the stored block.
+        """
+        store = get_chain_store()
+        try:
+            chain_index.refresh(store)
+            position = chain_index.lookup(block_hash)
+            if position is None:
+                return False, "Block not found in blockchain."
+            reader = get_chain_reader(store)
+            block = reader.block(position)
+        except (OSError, ValueError):
+            return False, "Blockchain file corrupted."
+
+        # lookup() also accepts degree ids; this view is addressed by hash only
+        if block['hash'] != block_hash:
+            return False, "Block not found in blockchain."
+
+        valid, _ = BlockchainController._check_chain_block(block)
+        return True, {'block': block, 'position': position, 'valid': valid}
\ No newline at end of file
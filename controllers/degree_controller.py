@@ -1,5 +1,10 @@
 from my_models import db, Degree, Student
+from utils.entity_cache import cached_student
 from datetime import datetime
+from itertools import islice
+from sqlalchemy import func
+from werkzeug.security import generate_password_hash
+from utils.degree_import import clean_degree_row
 
 # Rest of the file remains the same
 from datetime import datetime
@@ -9,7 +14,7 @@ class DegreeController:
     @staticmethod
     def add_degree(student_id, degree_name, institution, year_awarded, field_of_study):
         # Check if student exists
-        student = Student.query.filter_by(student_id=student_id).first()
+        student = cached_student(student_id)
         if not student:
             return False, "Student not found", None
         
@@ -45,13 +50,25 @@ class DegreeController:
     
     @staticmethod
     def get_student_degrees(student_id):
-        student = Student.query.filter_by(student_id=student_id).first()
+        student = cached_student(student_id)
         if not student:
             return False, "Student not found"
         
         degrees = Degree.query.filter_by(student_id=student_id).all()
         return True, degrees
     
+    @staticmethod
+    def get_approved_degrees(institution=None, year_awarded=None, field_of_study=None):
+        """Approved degrees matching the given cohort filters (None = any)"""
+        query = Degree.query.filter(Degree.status == 'Approved')
+        if institution:
+            query = query.filter(Degree.institution == institution)
+        if year_awarded:
+            query = query.filter(Degree.year_awarded == int(year_awarded))
+        if field_of_study:
+            query = query.filter(Degree.field_of_study == field_of_study)
+        return query.order_by(Degree.id).all()
+
     @staticmethod
     def get_degree_with_blockchain(degree_id):
         from my_models import Block
@@ -60,4 +77,119 @@ class DegreeController:
             return False, "Degree not found"
         
         block = Block.query.filter_by(degree_id=degree_id).first()
-        return True, degree, block
\ No newline at end of file
+        return True, degree, block
+
+    @staticmethod
+    def bulk_import(rows, batch_size=500, default_password='123456'):
+        """
+        Import (line_number, row) pairs in one transaction, flushed in batches.
+        - Missing students are created when the row has full_name and email.
+        - Each batch's degrees get pending blocks chained on from the previous
+          batch; the chain tip is looked up once for the whole import.
+        - The per-student cap of add_degree_to_blockchain applies, counting
+          non-rejected degrees already stored and earlier rows of this import.
+        Returns (True, summary) or (False, error message).
+        """
+        from my_models import Block
+        from controllers.blockchain_controller import BlockchainController
+
+        last_block = Block.query.order_by(Block.id.desc()).first()
+        if not last_block:
+            return False, "Blockchain not initialized"
+        previous_hash = last_block.current_hash
+
+        # one hash for the shared default password instead of one per student
+        password_hash = generate_password_hash(default_password)
+        summary = {'students_created': 0, 'degrees_created': 0, 'skipped': []}
+        seen = set()
+        rows = iter(rows)
+
+        try:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+
+                cleaned = []
+                for line_number, row in batch:
+                    data, error = clean_degree_row(row)
+                    if error:
+                        summary['skipped'].append({'line': line_number, 'error': error})
+                    else:
+                        cleaned.append((line_number, data))
+
+                # One query each for the batch's students, emails and existing degrees
+                student_ids = {d['student_id'] for _, d in cleaned}
+                emails = {d['email'] for _, d in cleaned if d['email']}
+                known_students = {
+                    sid for (sid,) in db.session.query(Student.student_id)
+                    .filter(Student.student_id.in_(student_ids))
+                }
+                taken_emails = {
+                    e for (e,) in db.session.query(Student.email).filter(Student.email.in_(emails))
+                } if emails else set()
+                existing = {
+                    (d.student_id, d.degree_name, d.institution, d.year_awarded, d.field_of_study)
+                    for d in Degree.query.filter(Degree.student_id.in_(student_ids))
+                }
+                # earlier batches are flushed, so this includes their rows
+                degree_counts = dict(
+                    db.session.query(Degree.student_id, func.count(Degree.id))
+                    .filter(Degree.student_id.in_(student_ids), Degree.status != 'Rejected')
+                    .group_by(Degree.student_id)
+                )
+
+                now = datetime.utcnow().replace(microsecond=0)
+                degrees = []
+                for line_number, data in cleaned:
+                    key = (data['student_id'], data['degree_name'], data['institution'],
+                           data['year_awarded'], data['field_of_study'])
+                    if key in existing or key in seen:
+                        summary['skipped'].append({'line': line_number, 'error': "Duplicate degree"})
+                        continue
+                    if degree_counts.get(data['student_id'], 0) + 1 >= 3:
+                        summary['skipped'].append({'line': line_number,
+                                                   'error': "Student already has 2 degrees submitted"})
+                        continue
+
+                    if data['student_id'] not in known_students:
+                        if not (data['full_name'] and data['email']):
+                            summary['skipped'].append({'line': line_number, 'error': "Student not found"})
+                            continue
+                        if data['email'] in taken_emails:
+                            summary['skipped'].append({'line': line_number, 'error': "Email already in use"})
+                            continue
+                        db.session.add(Student(
+                            student_id=data['student_id'],
+                            full_name=data['full_name'],
+                            email=data['email'],
+                            password_hash=password_hash
+                        ))
+                        known_students.add(data['student_id'])
+                        taken_emails.add(data['email'])
+                        summary['students_created'] += 1
+
+                    seen.add(key)
+                    degree_counts[data['student_id']] = degree_counts.get(data['student_id'], 0) + 1
+                    degrees.append(Degree(
+                        student_id=data['student_id'],
+                        degree_name=data['degree_name'],
+                        institution=data['institution'],
+                        year_awarded=data['year_awarded'],
+                        field_of_study=data['field_of_study'],
+                        created_at=now
+                    ))
+
+                if degrees:
+                    db.session.add_all(degrees)
+                    db.session.flush()
+                    previous_hash = BlockchainController.add_degrees_to_blockchain(degrees, previous_hash)
+                    summary['degrees_created'] += len(degrees)
+
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Import failed: {str(e)}"
+
+        summary['skipped'].sort(key=lambda s: s['line'])
+        return True, summary
@@ -2,9 +2,11 @@ from flask import Blueprint, render_template, request, redirect, session, url_fo
 from my_models import db, Student
 from my_models.degree import Degree
 from werkzeug.security import generate_password_hash, check_password_hash
-from utils.certificate_pdf import generate_pdf
+from utils.certificate_pdf import get_certificate_pdf
 from my_models.approval import Approval
-from utils.blockchain_utils import is_certificate_on_blockchain
+from my_models.blockchain import Block
+from utils.blockchain_utils import certificates_on_blockchain
+from utils.entity_cache import cached_student
 student_bp = Blueprint('student', __name__)
 import sys
 import os
@@ -22,7 +24,7 @@ class StudentController:
             return False, "All fields are required."
 
         # Check if student already exists
-        if Student.query.filter_by(student_id=student_id).first():
+        if cached_student(student_id):
             return False, "Student already exists."
 
         # Create student object
@@ -47,7 +49,7 @@ class StudentController:
     
     @staticmethod
     def get_student(student_id):
-        student = Student.query.filter_by(student_id=student_id).first()
+        student = cached_student(student_id)
         if not student:
             return False, "Student not found"
         return True, student
@@ -88,21 +90,30 @@ def dashboard():
         return redirect(url_for('student.login_student'))
 
     student_id = session['student_id']
-    student_obj = Student.query.filter_by(student_id=student_id).first()
+    student_obj = cached_student(student_id)
     cert_objs = Degree.query.filter_by(student_id=student_id).all()
+    degree_ids = [cert.id for cert in cert_objs]
+
+    # Approval counters straight off the blocks + one chain-index check for all degrees
+    approval_counts = dict(
+        db.session.query(Block.degree_id, Block.approval_count)
+        .filter(Block.degree_id.in_(degree_ids))
+        .all()
+    ) if degree_ids else {}
+    on_chain = certificates_on_blockchain(degree_ids)
 
     certificates = []
+    changed = False
     for cert in cert_objs:
-        # Check if approved by all 3 admins
-        approvals = Approval.query.filter_by(degree_id=cert.id, approval_status=True).count()
+        # Approved by all 3 admins and written to the chain
+        if approval_counts.get(cert.id, 0) >= 3 and cert.id in on_chain and cert.status != 'Approved':
+            cert.status = 'Approved'
+            changed = True
 
-        is_on_chain = is_certificate_on_blockchain(cert.id)  # You need to implement this function
-
-        if approvals == 3 and is_on_chain and cert.status != 'approved':
-            cert.status = 'approved'
-            db.session.commit()
+        certificates.append((cert.id, cert.status, cert.status == 'Approved'))
 
-        certificates.append((cert.id, cert.status, cert.status == 'approved'))
+    if changed:
+        db.session.commit()
 
     student = [student_obj.full_name, student_obj.student_id, student_obj.email]
 
@@ -121,8 +132,14 @@ def download_certificate(degree_id):
     if not degree:
         return "Certificate not found or not approved.", 403
 
-    pdf_path = generate_pdf(degree)  # your existing PDF logic
-    return send_file(pdf_path, as_attachment=True)
+    # Cached by block hash: a repeat download is just a file/bytes stream
+    pdf = get_certificate_pdf(degree)
+    return send_file(
+        pdf,
+        as_attachment=True,
+        download_name=f"{degree.student_id}_certificate.pdf",
+        mimetype='application/pdf'
+    )
 
 
 # -------- Admin Add Student Route -------- #
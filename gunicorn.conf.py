@@ -0,0 +1,26 @@
+import os
+
+# Threaded workers: a slow client (e.g. a vendor posting a large /api/verify
+# batch over a bad link) holds one thread, not a whole worker process.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+
+# Build the app (tables, admins, genesis, chain index) once in the master
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Pooled DB connections opened while preloading must not be shared across forks
+    from my_models import db
+    from utils.chain_writer import start_chain_writer
+
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():  # primary and read replica
+            engine.dispose(close=False)
+    # Every worker runs a writer thread; the writer lock lets one append at a
+    # time, so appends queued before a restart resume without waiting for a request
+    start_chain_writer(app)
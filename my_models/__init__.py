@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()  # Initialize db here
+from .session import RoutingSession, use_read_replica, read_replica
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})  # Initialize db here
 
 # Import all models after db is created
 from .admin import Admin
@@ -8,5 +10,8 @@ from .student import Student
 from .degree import Degree
 from .blockchain import Block
 from .approval import Approval
+from .chain_append import ChainAppend
+from .migrations import run_migrations, migration_status
 
-__all__ = ['db', 'Admin', 'Student', 'Degree', 'Block', 'Approval']
\ No newline at end of file
+__all__ = ['db', 'Admin', 'Student', 'Degree', 'Block', 'Approval', 'ChainAppend', 'run_migrations', 'migration_status',
+           'use_read_replica', 'read_replica']
\ No newline at end of file
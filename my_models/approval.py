@@ -4,6 +4,13 @@ from datetime import datetime
 
 class Approval(db.Model):
     __tablename__ = 'approvals'
+    UNIQUE_INDEX = 'uq_approvals_block_id_admin_id'
+    __table_args__ = (
+        db.Index(UNIQUE_INDEX, 'block_id', 'admin_id', unique=True),  # one per admin
+        db.Index('ix_approvals_block_id_approval_status', 'block_id', 'approval_status'),
+        db.Index('ix_approvals_degree_id_approval_status', 'degree_id', 'approval_status'),
+        db.Index('ix_approvals_admin_id', 'admin_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     block_id = db.Column(db.Integer, db.ForeignKey('blockchain.id'), nullable=False)
@@ -13,5 +20,15 @@ class Approval(db.Model):
     comments = db.Column(db.Text) 
     degree_id = db.Column(db.Integer, db.ForeignKey('degrees.id'), nullable=False)
     status = db.Column(db.String(20), nullable=False, default='pending')
+
+    @classmethod
+    def is_duplicate_error(cls, error):
+        """True if an IntegrityError is the (block, admin) unique index, i.e. a second approval by the same admin."""
+        diag = getattr(error.orig, 'diag', None)  # psycopg names the violated constraint
+        if diag is not None and getattr(diag, 'constraint_name', None):
+            return diag.constraint_name == cls.UNIQUE_INDEX
+        # SQLite names the columns instead
+        return 'UNIQUE constraint failed: approvals.block_id, approvals.admin_id' in str(error.orig)
+
     def __repr__(self):
         return f'<Approval Block:{self.block_id} Admin:{self.admin_id}>'
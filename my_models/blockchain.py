@@ -6,6 +6,11 @@ def utcnow_iso():
 
 class Block(db.Model):
     __tablename__ = 'blockchain'
+    __table_args__ = (
+        db.Index('ix_blockchain_degree_id_approved', 'degree_id', 'approved'),
+        db.Index('ix_blockchain_current_hash', 'current_hash'),
+        db.Index('ix_blockchain_approved_timestamp', 'approved', 'timestamp'),  # pending list, newest first
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     previous_hash = db.Column(db.String(255))
@@ -13,8 +18,10 @@ class Block(db.Model):
     degree_id = db.Column(db.Integer, db.ForeignKey('degrees.id'), nullable=True)
     timestamp = db.Column(db.DateTime, default=lambda: datetime.utcnow().replace(microsecond=0))
     
-    nonce = db.Column(db.Integer, nullable=False)
+    nonce = db.Column(db.BigInteger, nullable=False)  # mined nonces outgrow 32 bits at higher difficulties
     approved = db.Column(db.Boolean, default=False)
+    # Positive approvals so far; only ever changed by an atomic UPDATE ... RETURNING
+    approval_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     approvals = db.relationship('Approval', backref='block', lazy=True)
 
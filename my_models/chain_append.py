@@ -0,0 +1,46 @@
+from . import db
+
+from datetime import datetime
+
+
+class ChainAppend(db.Model):
+    """
+    One finalized block waiting for (or done with) its chain-storage append.
+    Written in the same transaction as the final approval; the chain writer
+    works through 'queued' rows in block order.
+    - check_linkage: the block must extend the chain tip. A block whose
+      predecessor is not on the chain yet is 'waiting' and retried as the
+      tip advances; one that can never extend it is 'failed'.
+    - Without check_linkage (the approval page) the block is appended as is.
+    """
+    __tablename__ = 'chain_appends'
+
+    QUEUED = 'queued'
+    WAITING = 'waiting'
+    APPENDED = 'appended'
+    FAILED = 'failed'
+
+    id = db.Column(db.Integer, primary_key=True)
+    block_id = db.Column(db.Integer, db.ForeignKey('blockchain.id'), nullable=False, unique=True)
+    status = db.Column(db.String(20), nullable=False, default=QUEUED, index=True)
+    check_linkage = db.Column(db.Boolean, nullable=False, default=True)
+    error = db.Column(db.Text)
+    position = db.Column(db.Integer)  # chain store position once appended
+    queued_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    block = db.relationship('Block', backref=db.backref('chain_append', uselist=False), lazy=True)
+
+    def to_dict(self):
+        return {
+            'block_id': self.block_id,
+            'status': self.status,
+            'check_linkage': self.check_linkage,
+            'error': self.error,
+            'position': self.position,
+            'queued_at': self.queued_at.isoformat() if self.queued_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<ChainAppend Block:{self.block_id} {self.status}>'
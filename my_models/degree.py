@@ -8,6 +8,9 @@ def utcnow_iso():
 
 class Degree(db.Model):
     __tablename__ = 'degrees'
+    __table_args__ = (
+        db.Index('ix_degrees_student_id_status', 'student_id', 'status'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.String(50), db.ForeignKey('students.student_id'), nullable=False)
@@ -0,0 +1,114 @@
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from . import db
+
+# Applied versions; created by db.create_all() like every other table
+schema_migrations = db.Table(
+    'schema_migrations',
+    db.Column('version', db.Integer, primary_key=True),
+    db.Column('name', db.String(100), nullable=False),
+    db.Column('applied_at', db.DateTime, nullable=False)
+)
+
+MIGRATIONS = []
+
+
+def migration(version, name):
+    """Register a schema migration; each one runs once, in its own transaction, in version order."""
+    def register(fn):
+        MIGRATIONS.append((version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+# (name, table, columns, unique) as of migration 1; kept in step with the models' __table_args__
+HOT_LOOKUP_INDEXES = [
+    ('ix_blockchain_degree_id_approved', 'blockchain', ('degree_id', 'approved'), False),
+    ('ix_blockchain_current_hash', 'blockchain', ('current_hash',), False),
+    ('ix_blockchain_approved_timestamp', 'blockchain', ('approved', 'timestamp'), False),
+    ('uq_approvals_block_id_admin_id', 'approvals', ('block_id', 'admin_id'), True),
+    ('ix_approvals_block_id_approval_status', 'approvals', ('block_id', 'approval_status'), False),
+    ('ix_approvals_degree_id_approval_status', 'approvals', ('degree_id', 'approval_status'), False),
+    ('ix_approvals_admin_id', 'approvals', ('admin_id',), False),
+    ('ix_degrees_student_id_status', 'degrees', ('student_id', 'status'), False),
+]
+
+
+@migration(1, 'hot_lookup_indexes')
+def _hot_lookup_indexes(conn):
+    # Keep the first approval per (block, admin) so the unique index can be built
+    conn.execute(text(
+        "DELETE FROM approvals WHERE id NOT IN "
+        "(SELECT MIN(id) FROM approvals GROUP BY block_id, admin_id)"
+    ))
+    for name, table, columns, unique in HOT_LOOKUP_INDEXES:
+        conn.execute(text(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} "
+            f"ON {table} ({', '.join(columns)})"
+        ))
+
+
+@migration(2, 'block_approval_count')
+def _block_approval_count(conn):
+    columns = {c['name'] for c in inspect(conn).get_columns('blockchain')}
+    if 'approval_count' not in columns:
+        conn.execute(text("ALTER TABLE blockchain ADD COLUMN approval_count INTEGER NOT NULL DEFAULT 0"))
+    # Backfill from the approvals recorded so far
+    conn.execute(text(
+        "UPDATE blockchain SET approval_count = (SELECT COUNT(*) FROM approvals "
+        "WHERE approvals.block_id = blockchain.id AND approvals.approval_status = :yes)"
+    ), {'yes': True})
+
+
+@migration(3, 'chain_append_check_linkage')
+def _chain_append_check_linkage(conn):
+    columns = {c['name'] for c in inspect(conn).get_columns('chain_appends')}
+    if 'check_linkage' not in columns:
+        conn.execute(text("ALTER TABLE chain_appends ADD COLUMN check_linkage BOOLEAN NOT NULL DEFAULT TRUE"))
+
+
+@migration(4, 'block_nonce_bigint')
+def _block_nonce_bigint(conn):
+    # SQLite's INTEGER is already 64-bit
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text("ALTER TABLE blockchain ALTER COLUMN nonce TYPE BIGINT"))
+
+
+def applied_versions(conn):
+    return {row.version for row in conn.execute(schema_migrations.select())}
+
+
+def migration_status(engine):
+    """[(version, name, applied)] for every known migration."""
+    with engine.connect() as conn:
+        applied = applied_versions(conn)
+    return [(version, name, version in applied) for version, name, _ in MIGRATIONS]
+
+
+def run_migrations(engine):
+    """
+    Apply pending migrations (call after db.create_all()).
+    - On a fresh database create_all() already built the current schema;
+      migrations are written to be no-ops there and are just recorded.
+    - A migration and its version row commit together, so a failure leaves
+      it pending for the next run.
+    Returns the (version, name) pairs applied.
+    """
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        applied = applied_versions(conn)
+
+    done = []
+    for version, name, fn in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version, name=name, applied_at=datetime.utcnow()))
+        print(f"🗄️ Applied migration {version:04d} {name}")
+        done.append((version, name))
+    return done
@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_BIND = 'replica'
+
+_use_replica = ContextVar('use_read_replica', default=False)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the `replica` bind inside use_read_replica().
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary, and
+    without a replica configured everything does.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _use_replica.get() and not self._flushing \
+                and not isinstance(clause, UpdateBase):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def use_read_replica():
+    """Route this block's reads to the read replica (if one is configured)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def read_replica(view):
+    """View decorator: a read-only endpoint that can tolerate replication lag."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with use_read_replica():
+            return view(*args, **kwargs)
+    return wrapper
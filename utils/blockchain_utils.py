@@ -1,4 +1,7 @@
 from .crypto import calculate_hash
+from .chain_store import get_chain_store
+from .chain_index import chain_index
+from .miner import mine
 from datetime import datetime
 import json
 import os
@@ -29,16 +32,12 @@ class Block:
         # Ensure datetime is in ISO format string
         timestamp_str = format_timestamp(self.timestamp)
 
-
-
-        # Ensure data is sorted before saving
-        sorted_data = json.loads(json.dumps(self.data, sort_keys=True))
-
+        # Key order doesn't matter: the canonical encoder sorts when hashing/storing
         return {
              "index": self.index,
              "previous_hash": self.previous_hash,
              "timestamp": timestamp_str,
-             "data": sorted_data,
+             "data": self.data,
              "nonce": self.nonce,
              "hash": self.hash
         }
@@ -65,20 +64,19 @@ class BlockchainUtils:
         Create a block dict with consistent structure for both DB and JSON
         """
         ts = format_timestamp(timestamp)  # ✅ normalize timestamp
-        sorted_data = json.loads(json.dumps(data, sort_keys=True))  # ✅ sort keys
 
         block_hash = calculate_hash(
             int(index),
             str(previous_hash),
             ts,
-            sorted_data,
+            data,
             int(nonce)
         )
         return {
         "index": int(index),
         "previous_hash": str(previous_hash),
         "timestamp": ts,
-        "data": sorted_data,
+        "data": data,
         "nonce": int(nonce),
         "hash": block_hash
     }
@@ -107,20 +105,19 @@ class BlockchainUtils:
         timestamp = utcnow_iso()
         timestamp = format_timestamp(timestamp)
 
-        nonce = 0
-        sorted_data = json.loads(json.dumps(data, sort_keys=True))
-        block = Block(index, previous_hash, timestamp, sorted_data, nonce)
+        # Proof of work at BLOCKCHAIN_DIFFICULTY (difficulty 0 keeps nonce 0)
+        nonce, _ = mine(index, previous_hash, timestamp, data)
+        block = Block(index, previous_hash, timestamp, data, nonce)
         return block.to_dict()
         
 
     @staticmethod
     def validate_block(block, previous_block):
-        sorted_data = json.loads(json.dumps(block['data'], sort_keys=True))
         expected_hash = calculate_hash(
             block['index'],
             block['previous_hash'],
             block['timestamp'],
-            sorted_data,
+            block['data'],
             block['nonce']
         )
         return (
@@ -145,20 +142,17 @@ class BlockchainUtils:
         return True
 
 
-def is_certificate_on_blockchain(degree_id):
+def certificates_on_blockchain(degree_ids):
+    """Subset of `degree_ids` that have a block on the chain (one index refresh, then dict probes)"""
     try:
-        path = os.path.join(os.path.dirname(__file__), '..', 'data', 'blockchain.json')
-        path = os.path.abspath(path)
-
-        with open(path, 'r') as f:
-            blockchain_data = json.load(f)
-
-        for block in blockchain_data:
-            if isinstance(block, dict) and block.get("data", {}).get("degree_id") == degree_id:
-                return True
-
-        return False
+        store = get_chain_store()
+        chain_index.refresh(store)
+        return {degree_id for degree_id in degree_ids if chain_index.has_degree(degree_id)}
 
     except Exception as e:
         print("Blockchain check error:", str(e))
-        return False
\ No newline at end of file
+        return set()
+
+
+def is_certificate_on_blockchain(degree_id):
+    return degree_id in certificates_on_blockchain([degree_id])
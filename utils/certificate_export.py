@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .certificate_pdf import render_certificate_bytes
+
+EXPORT_FILTERS = ('institution', 'year_awarded', 'field_of_study')
+
+
+class _ZipStream:
+    """
+    Write-only sink for zipfile: it has tell() but no seek(), so ZipFile
+    writes local headers + data descriptors and never rewinds. Bytes are
+    handed out with drain() as soon as each entry is written.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def certificate_filename(fields):
+    student_id = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in str(fields['student_id']))
+    return f"{student_id}_{fields['degree_id']}_certificate.pdf"
+
+
+def export_filename(filters):
+    """ZIP name for a cohort export; ASCII letters, digits, '-' and '_' only, so it is safe in a header."""
+    name = '_'.join(str(v) for v in filters.values() if v) or 'all'
+    name = ''.join(ch if (ch.isascii() and ch.isalnum()) or ch in '-_' else '_' for ch in name)
+    return f"certificates_{name[:100]}.zip"
+
+
+def iter_certificate_zip(field_sets, logo_path, workers=None):
+    """
+    Yield a ZIP archive of certificates chunk by chunk.
+    - PDFs render in a process pool (spawned, so it is safe inside a threaded
+      web worker) with at most 2 x workers renders in flight.
+    - Each PDF is added to the archive the moment it finishes, so memory stays
+      bounded by the in-flight window, not the cohort size.
+    """
+    workers = workers or os.cpu_count() or 1
+    stream = _ZipStream()
+    field_sets = iter(field_sets)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            in_flight = {}
+            exhausted = False
+            while in_flight or not exhausted:
+                while not exhausted and len(in_flight) < workers * 2:
+                    fields = next(field_sets, None)
+                    if fields is None:
+                        exhausted = True
+                        break
+                    in_flight[pool.submit(render_certificate_bytes, fields, logo_path)] = fields
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fields = in_flight.pop(future)
+                    archive.writestr(certificate_filename(fields), future.result())
+                    yield stream.drain()
+        yield stream.drain()  # central directory
+    finally:
+        # also runs when the client disconnects mid-download
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,64 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+_executor = None
+_executor_pid = None
+_pending = set()
+_lock = threading.Lock()
+
+
+def _get_executor(max_workers):
+    """Lazily created per process, so gunicorn workers forked after startup get their own pool."""
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cert-prerender')
+            _executor_pid = os.getpid()
+            _pending.clear()
+        return _executor
+
+
+def _prerender(app, degree_id):
+    from my_models import db, Degree
+    from utils.certificate_pdf import get_certificate_pdf
+
+    with app.app_context():
+        try:
+            degree = Degree.query.get(degree_id)
+            if degree:
+                pdf = get_certificate_pdf(degree)  # a cache miss renders and stores it
+                if hasattr(pdf, 'close'):
+                    pdf.close()
+                print(f"📄 Pre-rendered certificate for degree {degree_id}")
+        except Exception as e:
+            print(f"❌ Certificate pre-render failed for degree {degree_id}: {e}")
+        finally:
+            db.session.remove()
+            with _lock:
+                _pending.discard(degree_id)
+
+
+def schedule_prerender(degree_ids):
+    """
+    Queue certificate renders for degrees that just became final.
+    Call after the approval is committed; returns immediately. The pool size
+    (CERT_PRERENDER_WORKERS) caps how much ReportLab work runs at once, so a
+    graduation-day burst queues up instead of competing with requests.
+    """
+    if not current_app.config.get('CERT_PRERENDER_ENABLED', True):
+        return []
+
+    executor = _get_executor(current_app.config.get('CERT_PRERENDER_WORKERS', 2))
+    app = current_app._get_current_object()
+    queued = []
+    for degree_id in degree_ids:
+        with _lock:
+            if degree_id in _pending:
+                continue
+            _pending.add(degree_id)
+        executor.submit(_prerender, app, degree_id)
+        queued.append(degree_id)
+    return queued
@@ -1,133 +1,163 @@
 from flask import current_app
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 from datetime import datetime
+import io
 import os
+import tempfile
 
 from my_models import db
 from my_models.approval import Approval
 from my_models.admin import Admin
 from my_models.blockchain import Block
 from my_models.student import Student  # Make sure this is imported
+from utils.chain_index import chain_index
+from utils.chain_store import get_chain_store
+from utils.chain_reader import get_chain_reader
+from utils.pdf_cache import get_pdf_cache
+from utils.certificate_template import get_certificate_template
+from utils.entity_cache import cached_student
 
 
-import json
-
 def get_blockchain_hash(degree_id):
     try:
-        blockchain_path = current_app.config['JSON_STORAGE_PATH']
-        with open(blockchain_path, 'r') as f:
-            chain = json.load(f)
-
-        for block in reversed(chain):  # Start from the latest block
-            data = block.get('data', {})
-            if data.get('id') == degree_id:
-                return block.get('hash', 'Not Found')
-
-        return "Not Found"
+        store = get_chain_store()
+        chain_index.refresh(store)
+        position = chain_index.lookup(degree_id)
+        if position is None:
+            return "Not Found"
+
+        # the hash sits at the end of the mapped line; no need to decode the block
+        return get_chain_reader(store).stored_hash(position)
     except Exception as e:
         return f"Error: {str(e)}"
 
 
 
-def generate_pdf(degree):
+def _approved_by_text(approver_names):
+    return "Verified By: " + ", ".join(approver_names) if approver_names else "Verified By: Not Approved"
+
+
+def certificate_fields(degree, hash_id=None):
+    """Everything printed on a certificate, as plain values (safe to send to another process)"""
     # Get student details
-    student = Student.query.filter_by(student_id=degree.student_id).first()
+    student = cached_student(degree.student_id)
 
     student_name = student.full_name if student and student.full_name else "Unnamed Student"
 
-    # Get admin approvals
-    approvals = Approval.query.filter_by(degree_id=degree.id, approval_status=True).all()
-    approver_names = [Admin.query.get(a.admin_id).username for a in approvals if Admin.query.get(a.admin_id)]
-    approved_by_text = "Verified By: " + ", ".join(approver_names) if approver_names else "Verified By: Not Approved"
+    # Get admin approvals (one join instead of two Admin lookups per approval)
+    approver_names = [
+        username for (username,) in db.session.query(Admin.username)
+        .join(Approval, Approval.admin_id == Admin.id)
+        .filter(Approval.degree_id == degree.id, Approval.approval_status.is_(True))
+        .order_by(Approval.id)
+    ]
 
-    created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     # Get Blockchain Hash
-    hash_id = get_blockchain_hash(degree.id)
+    if hash_id is None:
+        hash_id = get_blockchain_hash(degree.id)
+
+    return {
+        'degree_id': degree.id,
+        'student_name': student_name,
+        'student_id': degree.student_id,
+        'degree_name': degree.degree_name,
+        'institution': degree.institution,
+        'status': degree.status,
+        'approved_by_text': _approved_by_text(approver_names),
+        'created_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'hash_id': hash_id
+    }
+
+
+def certificate_fields_bulk(degrees):
+    """certificate_fields() for many degrees with a fixed number of queries"""
+    degree_ids = [d.id for d in degrees]
+    student_ids = {d.student_id for d in degrees}
+
+    names = dict(
+        db.session.query(Student.student_id, Student.full_name)
+        .filter(Student.student_id.in_(student_ids))
+    ) if student_ids else {}
+
+    approvers = {}
+    if degree_ids:
+        for degree_id, username in (
+            db.session.query(Approval.degree_id, Admin.username)
+            .join(Admin, Admin.id == Approval.admin_id)
+            .filter(Approval.degree_id.in_(degree_ids), Approval.approval_status.is_(True))
+            .order_by(Approval.id)
+        ):
+            approvers.setdefault(degree_id, []).append(username)
+
+    store = get_chain_store()
+    chain_index.refresh(store)
+    reader = get_chain_reader(store)
+    created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Certificate file path
-    filename = f"{degree.student_id}_certificate.pdf"
-    cert_dir = os.path.join(current_app.root_path, "data", "certificates")
-    os.makedirs(cert_dir, exist_ok=True)
-    filepath = os.path.join(cert_dir, filename)
-
-    # Create canvas
-    c = canvas.Canvas(filepath, pagesize=letter)
-    width, height = letter
-
-    # Logo path
-    logo_path = os.path.join(current_app.root_path, "static", "images", "logo.png")
-
-# Draw logo centered at the top
-    if os.path.exists(logo_path):
-     logo_width = 100
-     logo_height = 100
-     page_width, page_height = letter
-     x = (page_width - logo_width) / 2
-     y = page_height - logo_height - 70  # margin from top
-     c.drawImage(logo_path, x, y, width=logo_width, height=logo_height, preserveAspectRatio=True)
-
-
-    # Border
-    margin = 50
-    c.setStrokeColor(colors.HexColor("#1A237E"))  # Indigo
-    c.setLineWidth(4)
-    c.rect(margin, margin, width - 2 * margin, height - 2 * margin)
-
-    # Title
-    c.setFont("Helvetica-Bold", 24)
-    c.setFillColor(colors.HexColor("#0D47A1"))
-    c.drawCentredString(width / 2, height - 200, "UNIVERSITY OF KASHMIR")
-
-    c.setFont("Helvetica-Bold", 18)
-    c.setFillColor(colors.black)
-    c.drawCentredString(width / 2, height - 250, "Degree Certificate")
-    
-
-    # Certificate Text
-    c.setFont("Helvetica", 13)
-    text_y = height - 300
-    line_spacing = 40
-
-    lines = [
-        f"This is to certify that",
-        f"{student_name}",
-        f"bearing Student ID {degree.student_id},",
-        f"has successfully completed the degree of",
-        f"{degree.degree_name}",
-        f"from {degree.institution}.",
-       # c.drawString(100, 600, f"Created Date: {created_date}")
-        #f"Course Duration: 2022 - 2025",
-        f"Status: {degree.status}",
-        f"Approved By: {approved_by_text}",
-        f"Created Date: {created_date}",
-    ]
+    fields = []
+    for degree in degrees:
+        position = chain_index.lookup(degree.id)
+        fields.append({
+            'degree_id': degree.id,
+            'student_name': names.get(degree.student_id) or "Unnamed Student",
+            'student_id': degree.student_id,
+            'degree_name': degree.degree_name,
+            'institution': degree.institution,
+            'status': degree.status,
+            'approved_by_text': _approved_by_text(approvers.get(degree.id)),
+            'created_date': created_date,
+            'hash_id': reader.stored_hash(position) if position is not None else "Not Found"
+        })
+    return fields
 
-    for i, line in enumerate(lines):
-        if i in [1, 4]:  # Make name and degree bold
-            c.setFont("Helvetica-Bold", 14)
-        else:
-            c.setFont("Helvetica", 12)
-        c.drawCentredString(width / 2, text_y - i * line_spacing, line)
 
-    # Signature
-  #  c.line(width / 2 - 150, 140, width / 2 - 10, 140)
-   # c.setFont("Helvetica", 10)
-    #c.drawString(width / 2 - 150, 125, "Signature of Controller")
+def draw_certificate(target, fields, logo_path):
+    """Render one certificate to `target` (file path or binary file object). No app/DB access."""
+    get_certificate_template(logo_path).render(target, fields)
 
-    # Blockchain Hash ID
-    c.setFont("Helvetica-Oblique", 9)
-    c.setFillColor(colors.gray)
-    c.drawString(70, 100, f"Blockchain Hash ID: {hash_id}")
 
-    # Footer
-    c.setFont("Helvetica", 8)
-    c.setFillColor(colors.black)
-    c.drawCentredString(width / 2, 60, "This certificate is digitally secured and verifiable.")
+def render_certificate_bytes(fields, logo_path):
+    """PDF bytes for one certificate; top-level so process pools can call it."""
+    buffer = io.BytesIO()
+    draw_certificate(buffer, fields, logo_path)
+    return buffer.getvalue()
 
-    c.showPage()
-    c.save()
 
+def default_logo_path():
+    return os.path.join(current_app.root_path, "static", "images", "logo.png")
+
+
+def generate_pdf(degree, hash_id=None):
+    fields = certificate_fields(degree, hash_id=hash_id)
+
+    # Unique file per render so concurrent downloads never overwrite each other
+    cert_dir = os.path.join(current_app.root_path, "data", "certificates")
+    os.makedirs(cert_dir, exist_ok=True)
+    fd, filepath = tempfile.mkstemp(prefix=f"{degree.student_id}_{degree.id}_", suffix=".pdf", dir=cert_dir)
+    os.close(fd)
+
+    draw_certificate(filepath, fields, default_logo_path())
     return filepath
+
+
+def get_certificate_pdf(degree):
+    """
+    Certificate for `degree` as something send_file() accepts.
+    - On-chain degrees are served from the PDF cache keyed by block hash
+      (bytes, or an open cached file); a miss renders once.
+    - Degrees not on the chain yet are rendered fresh and never cached.
+    """
+    hash_id = get_blockchain_hash(degree.id)
+    cache = get_pdf_cache()
+
+    if cache.is_cacheable(hash_id):
+        cached = cache.get(hash_id)
+        if cached is None:
+            cached = cache.put(hash_id, generate_pdf(degree, hash_id=hash_id))
+        return io.BytesIO(cached) if isinstance(cached, bytes) else cached
+
+    filepath = generate_pdf(degree, hash_id=hash_id)
+    try:
+        with open(filepath, 'rb') as f:
+            return io.BytesIO(f.read())
+    finally:
+        os.remove(filepath)
@@ -0,0 +1,111 @@
+import os
+import threading
+
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.lib import colors
+
+
+class CertificateTemplate:
+    """
+    Certificate layout split into a static background and the per-degree fields.
+    - The logo file is opened and decoded once per process (one ImageReader,
+      reused by every certificate through the public drawImage()).
+    - Only public canvas calls, so it keeps working across ReportLab upgrades.
+    """
+
+    def __init__(self, logo_path=None, pagesize=letter):
+        self.pagesize = pagesize
+        self.width, self.height = pagesize
+        self.logo = None
+        if logo_path and os.path.exists(logo_path):
+            self.logo = ImageReader(logo_path)
+            self.logo.getRGBData()  # decode now, not in the first request
+
+    def _draw_background(self, c):
+        width, height = self.width, self.height
+
+        # Logo centered at the top
+        if self.logo is not None:
+            logo_width = 100
+            logo_height = 100
+            x = (width - logo_width) / 2
+            y = height - logo_height - 70  # margin from top
+            c.drawImage(self.logo, x, y, width=logo_width, height=logo_height, preserveAspectRatio=True)
+
+        # Border
+        margin = 50
+        c.setStrokeColor(colors.HexColor("#1A237E"))  # Indigo
+        c.setLineWidth(4)
+        c.rect(margin, margin, width - 2 * margin, height - 2 * margin)
+
+        # Title
+        c.setFont("Helvetica-Bold", 24)
+        c.setFillColor(colors.HexColor("#0D47A1"))
+        c.drawCentredString(width / 2, height - 200, "UNIVERSITY OF KASHMIR")
+
+        c.setFont("Helvetica-Bold", 18)
+        c.setFillColor(colors.black)
+        c.drawCentredString(width / 2, height - 250, "Degree Certificate")
+
+        # Footer
+        c.setFont("Helvetica", 8)
+        c.setFillColor(colors.black)
+        c.drawCentredString(width / 2, 60, "This certificate is digitally secured and verifiable.")
+
+    def new_canvas(self, target):
+        return canvas.Canvas(target, pagesize=self.pagesize)
+
+    def draw_page(self, c, fields):
+        """One certificate page: the static background plus this degree's fields."""
+        width, height = self.width, self.height
+        self._draw_background(c)
+
+        text_y = height - 300
+        line_spacing = 40
+        lines = [
+            "This is to certify that",
+            f"{fields['student_name']}",
+            f"bearing Student ID {fields['student_id']},",
+            "has successfully completed the degree of",
+            f"{fields['degree_name']}",
+            f"from {fields['institution']}.",
+            f"Status: {fields['status']}",
+            f"Approved By: {fields['approved_by_text']}",
+            f"Created Date: {fields['created_date']}",
+        ]
+
+        c.setFillColor(colors.black)
+        for i, line in enumerate(lines):
+            if i in [1, 4]:  # Make name and degree bold
+                c.setFont("Helvetica-Bold", 14)
+            else:
+                c.setFont("Helvetica", 12)
+            c.drawCentredString(width / 2, text_y - i * line_spacing, line)
+
+        # Blockchain Hash ID
+        c.setFont("Helvetica-Oblique", 9)
+        c.setFillColor(colors.gray)
+        c.drawString(70, 100, f"Blockchain Hash ID: {fields['hash_id']}")
+
+        c.showPage()
+
+    def render(self, target, fields):
+        """Write a one-page certificate to `target` (file path or binary file object)."""
+        c = self.new_canvas(target)
+        self.draw_page(c, fields)
+        c.save()
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def get_certificate_template(logo_path):
+    """Process-wide template per logo, so the logo is read from disk once per worker."""
+    with _templates_lock:
+        template = _templates.get(logo_path)
+        if template is None:
+            template = _templates[logo_path] = CertificateTemplate(logo_path)
+        return template
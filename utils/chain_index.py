@@ -0,0 +1,80 @@
+import threading
+
+
+class ChainIndex:
+    """
+    In-process lookup table for the chain store.
+    - Maps block hash and `data.id` (degree id, as a string) to the block's
+      position in the ChainStore, so a read is one seek into a segment.
+    - Remembers how many blocks it has indexed; when another process appends,
+      only the new tail is read on the next refresh().
+    - A store that was reset (new generation) or is shorter than what was
+      indexed is re-read from scratch.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_hash = {}
+        self._by_degree_id = {}
+        self._count = 0
+        self._generation = None
+
+    def _index_block(self, block, position):
+        self._by_hash[block['hash']] = position
+        degree_id = block.get('data', {}).get('id')
+        if degree_id is not None:
+            # keep the first block for a degree id, same as a linear scan would
+            self._by_degree_id.setdefault(str(degree_id), position)
+
+    def build(self, store):
+        """Read the whole store once and index it."""
+        with self._lock:
+            self._by_hash = {}
+            self._by_degree_id = {}
+            self._count = 0
+            self._generation = store.generation()
+            for position, block in store.iter_blocks():
+                self._index_block(block, position)
+                self._count = position + 1
+
+    def refresh(self, store):
+        """Index blocks appended since the last build/refresh (e.g. by another gunicorn worker)."""
+        length = len(store)
+        if length < self._count or store.generation() != self._generation:
+            self.build(store)
+            return
+        if length == self._count:
+            return
+        with self._lock:
+            for position, block in store.iter_blocks(self._count):
+                self._index_block(block, position)
+                self._count = position + 1
+
+    def add(self, block, position, store):
+        """Index a block this process just appended at `position`."""
+        with self._lock:
+            if position != self._count:
+                # someone else appended in between; catch up from the store instead
+                self.refresh(store)
+                return
+            self._index_block(block, position)
+            self._count = position + 1
+
+    def lookup(self, identifier):
+        """Return the store position for a hash or degree id, or None."""
+        identifier = str(identifier)
+        with self._lock:
+            position = self._by_hash.get(identifier)
+            if position is None:
+                position = self._by_degree_id.get(identifier)
+        return position
+
+    def has_degree(self, degree_id):
+        with self._lock:
+            return str(degree_id) in self._by_degree_id
+
+    def __len__(self):
+        return self._count
+
+
+chain_index = ChainIndex()
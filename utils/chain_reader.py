@@ -0,0 +1,171 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+
+from .chain_store import ChainStore, get_chain_store
+
+HASH_FIELD = b',"hash":"'
+PREVIOUS_HASH_FIELD = b',"previous_hash":"'
+
+
+class ChainReader:
+    """
+    Read-only, memory-mapped snapshot of a ChainStore.
+    - `chain.idx` is mapped as the offset table (16 bytes per block, no
+      Python objects per block).
+    - Segment files are mapped lazily; raw() hands out memoryview slices of
+      the mapping, so nothing is copied until a caller decodes a block.
+    - The snapshot is fixed at open time: blocks appended later are not seen
+      until a new reader is opened.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._segments = {}
+        self._idx = None
+        self._length = 0
+        self.signature = None
+        if os.path.exists(store.index_path):
+            with open(store.index_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                self._length = st.st_size // ChainStore.RECORD.size
+                self.signature = (st.st_ino, self._length)
+                if self._length:
+                    self._idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self._length
+
+    def _record(self, position):
+        if position < 0:
+            position += self._length
+        if position < 0 or position >= self._length:
+            raise IndexError(position)
+        return ChainStore.RECORD.unpack_from(self._idx, position * ChainStore.RECORD.size)
+
+    def _segment(self, segment):
+        mm = self._segments.get(segment)
+        if mm is None:
+            with open(self.store.segment_path(segment), 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._segments[segment] = mm
+        return mm
+
+    def _locate(self, position):
+        segment, offset, length = self._record(position)
+        return self._segment(segment), offset, offset + length - 1  # drop the '\n'
+
+    def raw(self, position):
+        """Zero-copy memoryview of the stored JSON line for a block."""
+        mm, start, end = self._locate(position)
+        return memoryview(mm)[start:end]
+
+    def block(self, position):
+        """Decode a single block."""
+        return json.loads(bytes(self.raw(position)))
+
+    def stored_hash(self, position):
+        mm, start, end = self._locate(position)
+        at = mm.rfind(HASH_FIELD, start, end)
+        if at < 0:
+            raise ValueError(f"Block {position} has no hash field")
+        return mm[at + len(HASH_FIELD):end - 2].decode('ascii')
+
+    def stored_previous_hash(self, position):
+        # previous_hash sorts after `data`, so the last match is the top-level key
+        mm, start, end = self._locate(position)
+        at = mm.rfind(PREVIOUS_HASH_FIELD, start, end)
+        if at < 0:
+            raise ValueError(f"Block {position} has no previous_hash field")
+        value_start = at + len(PREVIOUS_HASH_FIELD)
+        return mm[value_start:mm.find(b'"', value_start, end)].decode('ascii')
+
+    def payload(self, position):
+        """
+        Zero-copy view of the canonical hash payload, minus its closing brace.
+        sha256(payload + b'}') is the block hash for an untampered line.
+        """
+        mm, start, end = self._locate(position)
+        at = mm.rfind(HASH_FIELD, start, end)
+        if at < 0:
+            raise ValueError(f"Block {position} has no hash field")
+        return memoryview(mm)[start:at]
+
+    def verify(self, position):
+        """Re-hash a block straight from the mapped bytes."""
+        h = hashlib.sha256(self.payload(position))
+        h.update(b'}')
+        return h.hexdigest() == self.stored_hash(position)
+
+    def iter_blocks(self, start=0, stop=None):
+        """Yield (position, block), decoding one block at a time."""
+        stop = self._length if stop is None else min(stop, self._length)
+        for position in range(start, stop):
+            yield position, self.block(position)
+
+    def iter_lines(self, start=0, stop=None, batch=1000):
+        """
+        Yield the stored JSON lines (newline-terminated) in chunks of up to
+        `batch` blocks. A segment's lines are stored back to back, so each
+        chunk is one slice of the mapping.
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        position = start
+        while position < stop:
+            segment, offset, _ = self._record(position)
+            last = min(position + batch, stop) - 1
+            while self._record(last)[0] != segment:  # a chunk never spans two segments
+                last -= 1
+            _, last_offset, last_length = self._record(last)
+            yield self._segment(segment)[offset:last_offset + last_length]
+            position = last + 1
+
+    def close(self):
+        # Slices handed out by raw()/payload() keep the maps alive; let GC
+        # release those instead of failing with BufferError.
+        for mm in self._segments.values():
+            try:
+                mm.close()
+            except BufferError:
+                pass
+        self._segments = {}
+        if self._idx is not None:
+            try:
+                self._idx.close()
+            except BufferError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_readers = {}
+_readers_lock = threading.Lock()
+
+
+def _store_signature(store):
+    try:
+        st = os.stat(store.index_path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size // ChainStore.RECORD.size)
+
+
+def get_chain_reader(store=None):
+    """
+    Shared reader for the configured store.
+    Re-opened only when the store has grown (or been reset) since the last call.
+    """
+    if store is None:
+        store = get_chain_store()
+    with _readers_lock:
+        reader = _readers.get(store.directory)
+        if reader is None or reader.signature != _store_signature(store):
+            # the previous reader is left to GC: other threads may still hold it
+            reader = _readers[store.directory] = ChainReader(store)
+        return reader
@@ -0,0 +1,254 @@
+import fcntl
+import json
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+from flask import current_app
+
+from .crypto import canonical_payload
+
+
+def encode_block(block):
+    """
+    One JSON line per block.
+    The line is the canonical hash payload (sorted keys, no spaces) with the
+    `hash` field spliced in as the last key, so the bytes before `,"hash":`
+    are exactly what calculate_hash() digests.
+    """
+    payload = canonical_payload(
+        block['index'],
+        block['previous_hash'],
+        block['timestamp'],
+        block['data'],
+        block['nonce']
+    )
+    return (payload[:-1] + ',"hash":"' + str(block['hash']) + '"}\n').encode('utf-8')
+
+
+class ChainStore:
+    """
+    Append-only chain storage.
+    - Blocks live in JSON-lines segment files (`segment-000000.jsonl`, ...),
+      `segment_size` blocks per segment.
+    - `chain.idx` holds one fixed-width record per block
+      (segment, byte offset, line length), so block N is one seek away.
+    - A block only exists once its index record is written; data is fsync'd
+      before the record, so a crash never leaves an index entry pointing at
+      a half-written line.
+    - Writers take an flock on `chain.lock`, so appends from several
+      processes never claim the same position. Readers take no lock: they
+      only see records that are already complete.
+    """
+
+    RECORD = struct.Struct('<IQI')
+    INDEX_FILE = 'chain.idx'
+    LOCK_FILE = 'chain.lock'
+
+    def __init__(self, directory, segment_size=10000):
+        self.directory = directory
+        self.segment_size = int(segment_size)
+        self.index_path = os.path.join(directory, self.INDEX_FILE)
+        self.lock_path = os.path.join(directory, self.LOCK_FILE)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def locked(self):
+        """Exclusive write access across threads (self._lock) and processes (flock on chain.lock)."""
+        with self._lock, open(self.lock_path, 'a+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def segment_path(self, segment):
+        return os.path.join(self.directory, f'segment-{segment:06d}.jsonl')
+
+    def generation(self):
+        """Identity of the current chain: reset() renames a new index into place, which changes it."""
+        try:
+            return os.stat(self.index_path).st_ino
+        except FileNotFoundError:
+            return None
+
+    def __len__(self):
+        try:
+            return os.path.getsize(self.index_path) // self.RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def _record(self, position):
+        with open(self.index_path, 'rb') as f:
+            f.seek(position * self.RECORD.size)
+            raw = f.read(self.RECORD.size)
+        if len(raw) != self.RECORD.size:
+            raise IndexError(position)
+        return self.RECORD.unpack(raw)
+
+    def _normalize_position(self, position):
+        length = len(self)
+        if position < 0:
+            position += length
+        if position < 0 or position >= length:
+            raise IndexError(position)
+        return position
+
+    def read_raw(self, position):
+        """Raw JSON line (bytes, no newline) of the block at `position`."""
+        segment, offset, length = self._record(self._normalize_position(position))
+        with open(self.segment_path(segment), 'rb') as f:
+            f.seek(offset)
+            return f.read(length).rstrip(b'\n')
+
+    def get(self, position):
+        """Decoded block at `position` (negative positions count from the tip)."""
+        return json.loads(self.read_raw(position))
+
+    def tip(self):
+        if len(self) == 0:
+            return None
+        return self.get(-1)
+
+    def iter_blocks(self, start=0):
+        """Yield (position, block) from `start` to the current tip, one segment file at a time."""
+        length = len(self)
+        if start >= length:
+            return
+        with open(self.index_path, 'rb') as idx:
+            idx.seek(start * self.RECORD.size)
+            records = idx.read((length - start) * self.RECORD.size)
+
+        seg_file = None
+        seg_no = None
+        try:
+            for i, (segment, offset, size) in enumerate(self.RECORD.iter_unpack(records)):
+                if segment != seg_no:
+                    if seg_file:
+                        seg_file.close()
+                    seg_file = open(self.segment_path(segment), 'rb')
+                    seg_no = segment
+                seg_file.seek(offset)
+                yield start + i, json.loads(seg_file.read(size))
+        finally:
+            if seg_file:
+                seg_file.close()
+
+    def append(self, block):
+        """Append one block and return its position."""
+        return self.append_many([block])[0]
+
+    def append_many(self, blocks):
+        """Append blocks with one fsync per touched segment; returns their positions."""
+        lines = [encode_block(b) for b in blocks]
+        if not lines:
+            return []
+
+        with self.locked():
+            return self._append_lines(lines)
+
+    def _append_lines(self, lines):
+        """Write encoded lines at the tip; the caller holds the write lock."""
+        position = len(self)
+        # drop a torn record left by a crash mid-write
+        with open(self.index_path, 'ab') as idx:
+            idx.truncate(position * self.RECORD.size)
+
+        records = []
+        positions = []
+        i = 0
+        while i < len(lines):
+            segment = position // self.segment_size
+            room = self.segment_size - position % self.segment_size
+            batch = lines[i:i + room]
+            offset = self._segment_end(position)
+
+            mode = 'r+b' if os.path.exists(self.segment_path(segment)) else 'wb'
+            with open(self.segment_path(segment), mode) as f:
+                # anything past the last indexed line was never committed
+                f.seek(offset)
+                f.truncate()
+                for line in batch:
+                    f.write(line)
+                    records.append(self.RECORD.pack(segment, offset, len(line)))
+                    positions.append(position)
+                    offset += len(line)
+                    position += 1
+                f.flush()
+                os.fsync(f.fileno())
+            i += len(batch)
+
+        with open(self.index_path, 'ab') as idx:
+            idx.write(b''.join(records))
+            idx.flush()
+            os.fsync(idx.fileno())
+
+        return positions
+
+    def _segment_end(self, position):
+        """Byte offset where the block at `position` starts in its segment."""
+        if position % self.segment_size == 0:
+            return 0
+        _, offset, length = self._record(position - 1)
+        return offset + length
+
+    def reset(self, blocks=()):
+        """
+        Re-create the chain holding just `blocks` (e.g. the genesis block).
+        An empty index is renamed over the old one first, so other processes
+        (and a restart after a crash) see either the old chain or the new one;
+        readers that already have the old files mapped keep that snapshot.
+        """
+        lines = [encode_block(b) for b in blocks]
+        with self.locked():
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.index_path)
+            _fsync_directory(self.directory)
+
+            for name in os.listdir(self.directory):
+                if name.startswith('segment-') and name.endswith('.jsonl'):
+                    os.remove(os.path.join(self.directory, name))
+            return self._append_lines(lines) if lines else []
+
+    def import_json(self, path):
+        """
+        One-time migration of a legacy blockchain.json array into the store.
+        Skipped (returns []) when the store already has blocks, e.g. because
+        another worker imported it first.
+        """
+        with open(path, 'r') as f:
+            chain = json.load(f)
+        lines = [encode_block(b) for b in chain if isinstance(b, dict)]
+        with self.locked():
+            if len(self) > 0:
+                return []
+            return self._append_lines(lines)
+
+
+def _fsync_directory(directory):
+    """Make a rename in `directory` durable."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_chain_store(directory=None, segment_size=10000):
+    """Process-wide ChainStore for the configured directory."""
+    if directory is None:
+        directory = current_app.config['CHAIN_STORAGE_DIR']
+        segment_size = current_app.config.get('CHAIN_SEGMENT_SIZE', segment_size)
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = ChainStore(directory, segment_size)
+        return store
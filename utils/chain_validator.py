@@ -0,0 +1,97 @@
+import json
+import os
+
+from .blockchain_utils import BlockchainUtils
+from .chain_reader import ChainReader
+
+CHECKPOINT_FILE = 'checkpoint.json'
+
+
+class IncrementalValidator:
+    """
+    Validates the chain store from the last verified checkpoint onwards.
+    - The checkpoint is (position, block index, hash) of the newest block that
+      passed validation; it is persisted next to the segments.
+    - Each run first confirms the checkpointed block still carries the same
+      hash, then re-hashes only newer blocks from their stored bytes.
+    """
+
+    def __init__(self, store, checkpoint_path=None):
+        self.store = store
+        self.checkpoint_path = checkpoint_path or os.path.join(store.directory, CHECKPOINT_FILE)
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save_checkpoint(self, position, index, block_hash):
+        checkpoint = {'position': position, 'index': index, 'hash': block_hash}
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        return checkpoint
+
+    def clear_checkpoint(self):
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+
+    def _usable_checkpoint(self, reader):
+        """The stored checkpoint if the block it points at is unchanged, else None."""
+        checkpoint = self.load_checkpoint()
+        if not checkpoint:
+            return None
+        position = checkpoint.get('position', -1)
+        if position < 0 or position >= len(reader):
+            return None
+        if reader.stored_hash(position) != checkpoint.get('hash'):
+            return None
+        return checkpoint
+
+    def run(self, full=False):
+        """
+        Returns (True, summary) or (False, message).
+        `full=True` ignores the checkpoint and re-validates from genesis.
+        """
+        with ChainReader(self.store) as reader:
+            if len(reader) == 0:
+                return False, "Blockchain is empty"
+
+            checkpoint = None if full else self._usable_checkpoint(reader)
+            if checkpoint:
+                start = checkpoint['position'] + 1
+                previous_hash = checkpoint['hash']
+            else:
+                genesis = BlockchainUtils.create_genesis_block()
+                if reader.stored_hash(0) != genesis['hash'] or not reader.verify(0):
+                    return False, "Genesis block does not match"
+                start = 1
+                previous_hash = genesis['hash']
+
+            last = None
+            for position in range(start, len(reader)):
+                block = reader.block(position)
+                if block['previous_hash'] != previous_hash:
+                    return False, f"Broken link at block {block['index']} (position {position})"
+                if not reader.verify(position):
+                    return False, f"Hash mismatch at block {block['index']} (position {position})"
+                previous_hash = block['hash']
+                last = (position, block['index'], block['hash'])
+
+            if last:
+                checkpoint = self.save_checkpoint(*last)
+            elif not checkpoint:
+                checkpoint = self.save_checkpoint(0, reader.block(0)['index'], previous_hash)
+
+            return True, {
+                'checked': len(reader) - start,
+                'length': len(reader),
+                'checkpoint': checkpoint
+            }
@@ -0,0 +1,82 @@
+import fcntl
+import os
+import threading
+
+LOCK_FILE = 'writer.lock'
+
+_thread = None
+_thread_pid = None
+_wake = threading.Event()
+_lock = threading.Lock()
+
+
+def notify_chain_writer():
+    """Wake this process's writer thread; call after committing new ChainAppend rows."""
+    _wake.set()
+
+
+def run_chain_writer(app, once=False):
+    """
+    Single-writer loop over the ChainAppend queue.
+    - Blocks until it holds an exclusive flock on `writer.lock` in the chain
+      directory, so exactly one process in the deployment appends; the
+      others wait and take over if the holder exits.
+    - Drains queued appends in block order, then sleeps until notified
+      (same process) or CHAIN_WRITER_POLL_INTERVAL passes (rows queued by
+      other workers).
+    - once=True drains what is queued and returns the number processed.
+    """
+    from my_models import db
+    from controllers import BlockchainController
+
+    directory = app.config['CHAIN_STORAGE_DIR']
+    os.makedirs(directory, exist_ok=True)
+    poll = app.config.get('CHAIN_WRITER_POLL_INTERVAL', 0.5)
+    batch_size = app.config.get('CHAIN_WRITER_BATCH_SIZE', 100)
+
+    with open(os.path.join(directory, LOCK_FILE), 'a+b') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        print(f"✍️ Chain writer active in process {os.getpid()}")
+        processed = 0
+        while True:
+            _wake.clear()
+            with app.app_context():
+                try:
+                    done = BlockchainController.process_chain_appends(limit=batch_size)
+                except Exception as e:
+                    print(f"❌ Chain writer error: {e}")
+                    db.session.rollback()
+                    done = 0
+                finally:
+                    db.session.remove()
+            processed += done
+            if done:
+                continue  # a full batch may mean more is waiting
+            if once:
+                return processed
+            _wake.wait(poll)
+
+
+def start_chain_writer(app):
+    """
+    Start the writer thread for this process (idempotent, re-started after a fork).
+    Disabled with CHAIN_WRITER_THREAD=false when `flask chain writer` runs as
+    its own process instead.
+    """
+    global _thread, _thread_pid
+    if not app.config.get('CHAIN_WRITER_THREAD', True):
+        return None
+    with _lock:
+        if _thread is None or _thread_pid != os.getpid():
+            _thread = threading.Thread(target=run_chain_writer, args=(app,), name='chain-writer', daemon=True)
+            _thread.start()
+            _thread_pid = os.getpid()
+        return _thread
+
+
+def init_chain_writer(app):
+    """Start the writer lazily in whichever process serves requests (never in a preloading master)."""
+    @app.before_request
+    def _ensure_chain_writer():
+        if _thread_pid != os.getpid():
+            start_chain_writer(app)
@@ -6,26 +6,46 @@ from Crypto.Hash import SHA256
 from datetime import datetime
 
 
-def calculate_hash(index, previous_hash, timestamp, data, nonce):
+# One shared encoder: sort_keys sorts nested dicts too, so no pre-sorting pass is needed
+_canonical_encoder = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
+
+
+def _has_non_str_keys(value):
+    """True if any dict in `value`, at any depth, has a key that is not a string."""
+    if isinstance(value, dict):
+        return any(not isinstance(k, str) or _has_non_str_keys(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_str_keys(v) for v in value)
+    return False
+
+
+def canonical_payload(index, previous_hash, timestamp, data, nonce):
     """
-    Canonical SHA256 hash for a block.
-    - `timestamp` must be a string (ISO, no microseconds).
-    - `data` must be a plain dict with keys sorted.
+    Canonical JSON string of the hashed block fields, in a single encode pass.
+    - Keys sorted at every level, no whitespace.
+    - Byte-identical to the old json.loads(json.dumps(...)) + json.dumps path:
+      data with non-string keys (at any depth) still goes through that round
+      trip, which turns them into strings before sorting.
     """
-    # Ensure data is JSON-serializable with sorted keys
-    normalized_data = json.loads(json.dumps(data, sort_keys=True))
+    if _has_non_str_keys(data):
+        data = json.loads(json.dumps(data, sort_keys=True))
 
-    payload = {
+    return _canonical_encoder.encode({
         "index": int(index),
         "previous_hash": str(previous_hash),
         "timestamp": str(timestamp),
-        "data": normalized_data,
+        "data": data,
         "nonce": int(nonce)
-    }
+    })
 
-    # Deterministic JSON: sort keys and remove unnecessary spaces
-    block_string = json.dumps(payload, sort_keys=True, separators=(',', ':'))
 
+def calculate_hash(index, previous_hash, timestamp, data, nonce):
+    """
+    Canonical SHA256 hash for a block.
+    - `timestamp` must be a string (ISO, no microseconds).
+    - `data` must be a plain dict; key order does not matter.
+    """
+    block_string = canonical_payload(index, previous_hash, timestamp, data, nonce)
     return hashlib.sha256(block_string.encode('utf-8')).hexdigest()
 
 
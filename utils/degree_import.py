@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+
+REQUIRED_FIELDS = ('student_id', 'degree_name', 'institution', 'year_awarded', 'field_of_study')
+STUDENT_FIELDS = ('full_name', 'email')
+
+
+def detect_format(filename, default='csv'):
+    """'csv' or 'jsonl' from a file name."""
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def parse_degree_rows(stream, fmt='csv'):
+    """
+    Yield (line_number, row_dict) from a binary CSV (with header) or JSON-lines stream.
+    Rows are read lazily, so large uploads are never held in memory as a whole.
+    """
+    stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if fmt == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                row = {'_error': f"Invalid JSON: {e}"}
+            if not isinstance(row, dict):
+                row = {'_error': "Row must be a JSON object"}
+            yield line_number, row
+    else:
+        reader = csv.DictReader(stream)
+        for line_number, row in enumerate(reader, start=2):  # line 1 is the header
+            yield line_number, {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+
+
+def clean_degree_row(row):
+    """Returns (cleaned_row, None) or (None, error message)."""
+    if '_error' in row:
+        return None, row['_error']
+
+    missing = [f for f in REQUIRED_FIELDS if not row.get(f)]
+    if missing:
+        return None, f"Missing fields: {', '.join(missing)}"
+
+    try:
+        year_awarded = int(row['year_awarded'])
+    except (TypeError, ValueError):
+        return None, f"Invalid year_awarded: {row['year_awarded']}"
+
+    cleaned = {f: str(row[f]).strip() for f in REQUIRED_FIELDS if f != 'year_awarded'}
+    cleaned['year_awarded'] = year_awarded
+    for f in STUDENT_FIELDS:
+        cleaned[f] = str(row[f]).strip() if row.get(f) else None
+    return cleaned, None
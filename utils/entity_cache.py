@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached, object_session
+
+from my_models.session import RoutingSession
+
+
+class EntityCache:
+    """
+    Read-through TTL + LRU cache for one near-static model (Admin, Student).
+    - Entries are detached snapshots of the row's columns, keyed by
+      (attribute, value), e.g. ('student_id', 'S123'). A hit is merged into
+      the caller's session without a query, so relationships still lazy-load.
+    - Only found rows are cached; a miss for an unknown key always asks the DB.
+    - Inserts, updates and deletes through the ORM invalidate the row in this
+      process when flushed and again on commit (a concurrent read in between
+      may have cached the old row). Other gunicorn workers see the change
+      within `ttl`.
+    """
+
+    def __init__(self, model, maxsize=1024, ttl=300):
+        self.model = model
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (attr, value) -> (expires_at, snapshot)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, attr, value):
+        """The model instance whose `attr` equals `value` (attached to db.session), or None."""
+        from my_models import db
+
+        key = (attr, value)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                snapshot = entry[1]
+            else:
+                if entry:
+                    del self._entries[key]  # expired
+                self.misses += 1
+                snapshot = None
+
+        if snapshot is not None:
+            # Never overwrite an instance the session already holds (it may have unflushed changes)
+            existing = db.session.identity_map.get(inspect(snapshot).identity_key)
+            return existing if existing is not None else db.session.merge(snapshot, load=False)
+
+        instance = self.model.query.filter_by(**{attr: value}).first()
+        if instance is not None and not db.session.is_modified(instance):
+            self._store(key, instance, now)
+        return instance
+
+    def _store(self, key, instance, now):
+        columns = {c.key: getattr(instance, c.key) for c in inspect(self.model).column_attrs}
+        snapshot = self.model(**columns)
+        make_transient_to_detached(snapshot)
+        with self._lock:
+            self._entries[key] = (now + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, row_id):
+        """Drop every entry for this row (whatever attribute it was looked up by)."""
+        with self._lock:
+            stale = [k for k, (_, snapshot) in self._entries.items() if snapshot.id == row_id]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'model': self.model.__name__,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_entity_cache(model):
+    """Process-wide EntityCache for `model`; ORM writes to the model invalidate it."""
+    with _caches_lock:
+        cache = _caches.get(model)
+        if cache is None:
+            cache = _caches[model] = EntityCache(
+                model,
+                maxsize=current_app.config.get('ENTITY_CACHE_SIZE', 1024),
+                ttl=current_app.config.get('ENTITY_CACHE_TTL', 300)
+            )
+            for name in ('after_insert', 'after_update', 'after_delete'):
+                event.listen(model, name, lambda mapper, connection, target: _row_written(cache, target))
+        return cache
+
+
+def _row_written(cache, target):
+    cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('entity_cache_written', set()).add((cache, target.id))
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _after_commit(session):
+    for cache, row_id in session.info.pop('entity_cache_written', ()):
+        cache.invalidate(row_id)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('entity_cache_written', None)
+
+
+def cached_admin(admin_id):
+    from my_models import Admin
+    return get_entity_cache(Admin).get('id', int(admin_id))
+
+
+def cached_student(student_id):
+    from my_models import Student
+    return get_entity_cache(Student).get('student_id', student_id)
+
+
+def entity_cache_stats():
+    """Hit/miss counters of every cache in this process."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
@@ -0,0 +1,57 @@
+import hashlib
+
+from flask import current_app, make_response, request, session
+
+
+def block_response(block_hash, render):
+    """
+    API response derived from one block on the chain (JSON only).
+    - The block hash is the strong ETag: the block can never change, so
+      neither can anything rendered from it.
+    - Cache-Control is public, long-lived and `immutable`, so CDNs share it.
+    - A matching If-None-Match gets a 304 before `render` is even called.
+    """
+    if request.if_none_match.contains(block_hash):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(render())
+
+    response.set_etag(block_hash)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config['BLOCK_CACHE_MAX_AGE']
+    response.cache_control.immutable = True
+    return response
+
+
+def page_response(block_hash, render):
+    """
+    HTML page for one block. base.html also shows the visitor's session
+    (admin menu, flashed messages), so it is never reused blindly:
+    - Cache-Control: private, no-cache; the browser revalidates every view.
+    - The ETag covers the block hash and whether an admin is logged in, so a
+      304 only comes back for the same chrome; pending flashed messages
+      always get a fresh render.
+    """
+    etag = hashlib.sha256(f"{block_hash}:{'admin_id' in session}".encode()).hexdigest()
+    if '_flashes' not in session and request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(render())
+
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def uncached_response(response, no_store=False):
+    """
+    Answers that may change: "not found" (the block may be appended later) is
+    revalidated every time; no_store=True for results that must never be kept,
+    such as a failed tamper check.
+    """
+    if no_store:
+        response.cache_control.no_store = True
+    else:
+        response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,241 @@
+import fcntl
+import hashlib
+import os
+import threading
+
+from flask import current_app
+
+from .chain_reader import ChainReader
+from .chain_store import get_chain_store
+
+# Domain separation: a leaf can never be passed off as an inner node (or vice versa)
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+NODE_SIZE = 32
+
+
+def leaf_hash(block_hash):
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(block_hash)).digest()
+
+
+def node_hash(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def bag_peaks(peaks):
+    """Fold the mountain peaks right to left into the single published root."""
+    root = peaks[-1]
+    for peak in reversed(peaks[:-1]):
+        root = node_hash(peak, root)
+    return root
+
+
+def mountains(leaf_count):
+    """
+    (height, first leaf, first node position) of each perfect subtree, left to
+    right. Nodes are numbered in postorder, so appending never moves a node.
+    """
+    result = []
+    first_leaf = first_node = 0
+    for height in range(leaf_count.bit_length() - 1, -1, -1):
+        if leaf_count & (1 << height):
+            result.append((height, first_leaf, first_node))
+            first_leaf += 1 << height
+            first_node += (1 << (height + 1)) - 1
+    return result
+
+
+def node_count(leaf_count):
+    return 2 * leaf_count - bin(leaf_count).count('1')
+
+
+def leaf_position(leaf_index):
+    """Node position of a leaf: everything before it is full mountains of smaller indexes."""
+    return node_count(leaf_index)
+
+
+def _locate_leaf(leaf_index, leaf_count):
+    """Mountain number, its height and the left/right steps from its peak down to the leaf."""
+    for number, (height, first_leaf, first_node) in enumerate(mountains(leaf_count)):
+        if leaf_index < first_leaf + (1 << height):
+            offset = leaf_index - first_leaf
+            # bit h-1 of the offset picks the side at the top, bit 0 at the bottom
+            sides = ['right' if offset & (1 << level) else 'left' for level in range(height)]
+            return number, height, first_node, offset, sides
+    raise IndexError(leaf_index)
+
+
+def verify_inclusion(proof, root=None):
+    """
+    Check an inclusion proof offline: needs nothing but hashlib and the proof.
+    - `root` is the published root to trust (hex). Without it, only the
+      proof's internal consistency is checked against its own `root`.
+    - The path shape is re-derived from leaf_index/leaf_count, so a proof
+      cannot claim a different position than the one it proves.
+    """
+    try:
+        number, height, _, _, sides = _locate_leaf(proof['leaf_index'], proof['leaf_count'])
+    except (IndexError, KeyError, TypeError):
+        return False
+
+    path = proof.get('path', [])
+    peaks = [bytes.fromhex(p) for p in proof.get('peaks', [])]
+    if len(path) != height or proof.get('peak_index') != number \
+            or len(peaks) != len(mountains(proof['leaf_count'])):
+        return False
+
+    node = leaf_hash(proof['block_hash'])
+    for step, side in zip(path, sides):
+        if step['side'] != ('left' if side == 'right' else 'right'):
+            return False
+        sibling = bytes.fromhex(step['hash'])
+        node = node_hash(sibling, node) if step['side'] == 'left' else node_hash(node, sibling)
+
+    if peaks[number] != node:
+        return False
+    return bag_peaks(peaks).hex() == (root or proof['root'])
+
+
+class MerkleMountainRange:
+    """
+    Merkle Mountain Range over the chain's block hashes (leaf i = store position i).
+    - Nodes live in `mmr.bin` next to the chain segments: 32 bytes each, in
+      postorder, so an append only ever adds nodes at the end.
+    - sync() hashes in whatever the chain store has gained since the last
+      call (about two node hashes per block); proofs read O(log n) nodes.
+    - It is derived data: a torn write or a re-created chain is detected and
+      rebuilt from the store.
+    """
+
+    FILE = 'mmr.bin'
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, self.FILE)
+        self._lock = threading.Lock()
+        if not os.path.exists(self.path):
+            open(self.path, 'ab').close()
+
+    def _node(self, fd, position):
+        data = os.pread(fd, NODE_SIZE, position * NODE_SIZE)
+        if len(data) != NODE_SIZE:
+            raise ValueError(f"MMR node {position} missing")
+        return data
+
+    def leaf_count(self):
+        """Leaves covered by the complete nodes on disk."""
+        nodes = os.path.getsize(self.path) // NODE_SIZE
+        leaves = 0
+        for height in range(max(nodes, 1).bit_length(), -1, -1):
+            size = (1 << (height + 1)) - 1
+            if nodes >= size:
+                nodes -= size
+                leaves += 1 << height
+        return leaves
+
+    def sync(self, store):
+        """Append leaves (and their parents) for blocks added to `store` since the last sync."""
+        with self._lock, open(self.path, 'r+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)  # another worker may be syncing the same file
+            try:
+                return self._sync(f, store)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _sync(self, f, store):
+        fd = f.fileno()
+        with ChainReader(store) as reader:
+            total = len(reader)
+            leaves = self.leaf_count()
+            if leaves and (leaves > total or
+                           self._node(fd, leaf_position(leaves - 1)) != leaf_hash(reader.stored_hash(leaves - 1))):
+                leaves = 0  # the chain was re-created; start over
+            f.truncate(node_count(leaves) * NODE_SIZE)  # also drops a torn tail
+            if leaves == total:
+                return total
+
+            pending = {}
+            size = node_count(leaves)
+
+            def node_at(position):
+                return pending[position] if position in pending else self._node(fd, position)
+
+            for leaf in range(leaves, total):
+                position = size
+                node = pending[position] = leaf_hash(reader.stored_hash(leaf))
+                height = 0
+                remaining = leaf
+                while remaining & 1:  # each trailing 1 bit closes a mountain of that height
+                    left = node_at(position - ((1 << (height + 1)) - 1))
+                    node = node_hash(left, node)
+                    position += 1
+                    pending[position] = node
+                    height += 1
+                    remaining >>= 1
+                size = position + 1
+
+            f.seek(node_count(leaves) * NODE_SIZE)
+            f.write(b''.join(pending[p] for p in range(node_count(leaves), size)))
+            return total
+
+    def root(self, leaf_count=None):
+        """Hex root over the first `leaf_count` leaves (default: all of them)."""
+        leaf_count = self.leaf_count() if leaf_count is None else leaf_count
+        if leaf_count == 0:
+            return None
+        with open(self.path, 'rb') as f:
+            fd = f.fileno()
+            peaks = [self._node(fd, first_node + (1 << (height + 1)) - 2)
+                     for height, _, first_node in mountains(leaf_count)]
+        return bag_peaks(peaks).hex()
+
+    def proof(self, leaf_index, block_hash, leaf_count=None):
+        """
+        Inclusion proof for leaf `leaf_index` against the root over `leaf_count`
+        leaves: the sibling path up to its mountain's peak plus every peak.
+        """
+        leaf_count = self.leaf_count() if leaf_count is None else leaf_count
+        number, height, first_node, offset, sides = _locate_leaf(leaf_index, leaf_count)
+
+        with open(self.path, 'rb') as f:
+            fd = f.fileno()
+            path = []
+            node = first_node  # root of the current subtree is node + 2^(h+1) - 2
+            for level in range(height - 1, -1, -1):
+                left_root = node + (1 << (level + 1)) - 2
+                right_root = left_root + (1 << (level + 1)) - 1
+                if sides[level] == 'left':
+                    path.append({'side': 'right', 'hash': self._node(fd, right_root).hex()})
+                else:
+                    path.append({'side': 'left', 'hash': self._node(fd, left_root).hex()})
+                    node = left_root + 1
+            path.reverse()  # bottom-up, the order a verifier hashes in
+
+            if self._node(fd, leaf_position(leaf_index)) != leaf_hash(block_hash):
+                raise ValueError(f"Leaf {leaf_index} does not match block {block_hash[:8]}...")
+
+            peaks = [self._node(fd, start + (1 << (h + 1)) - 2) for h, _, start in mountains(leaf_count)]
+
+        return {
+            'leaf_index': leaf_index,
+            'leaf_count': leaf_count,
+            'block_hash': block_hash,
+            'path': path,
+            'peaks': [p.hex() for p in peaks],
+            'peak_index': number,
+            'root': bag_peaks(peaks).hex()
+        }
+
+
+_ranges = {}
+_ranges_lock = threading.Lock()
+
+
+def get_chain_mmr(store=None):
+    """Process-wide MerkleMountainRange for the configured chain store."""
+    if store is None:
+        store = get_chain_store()
+    with _ranges_lock:
+        mmr = _ranges.get(store.directory)
+        if mmr is None:
+            mmr = _ranges[store.directory] = MerkleMountainRange(store.directory)
+        return mmr
@@ -0,0 +1,187 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from flask import current_app
+
+from .crypto import canonical_payload
+
+# Top-level keys sort as data, index, nonce, previous_hash, timestamp, so the
+# nonce always sits between these two fixed markers, after the degree data.
+NONCE_MARKER = ',"nonce":'
+AFTER_NONCE_MARKER = ',"previous_hash":'
+
+CHUNK_SIZE = 50000          # nonces per pool task
+PARALLEL_MIN_DIFFICULTY = 5  # below this a search is too short to be worth the pool
+MAX_NONCE = 2 ** 63 - 1      # Block.nonce is a BIGINT
+MAX_DIFFICULTY = 15          # expected nonce 16**15 = 2**60, well inside MAX_NONCE
+
+
+def split_payload(index, previous_hash, timestamp, data):
+    """
+    Canonical payload as (prefix, suffix) bytes around the nonce digits, so an
+    attempt is sha256(prefix + str(nonce) + suffix) without re-encoding the block.
+    """
+    payload = canonical_payload(index, previous_hash, timestamp, data, 0)
+    at = payload.rfind(NONCE_MARKER + '0' + AFTER_NONCE_MARKER)
+    if at < 0:
+        raise ValueError("Unexpected canonical payload layout")
+    cut = at + len(NONCE_MARKER)
+    return payload[:cut].encode('utf-8'), payload[cut + 1:].encode('utf-8')
+
+
+def target_for(difficulty):
+    """Hashes (as 32 big-endian bytes) below this have `difficulty` (1-63) leading hex zeros."""
+    if not 0 < difficulty < 64:
+        raise ValueError(f"Difficulty must be between 1 and 63 hex digits, got {difficulty}")
+    return (1 << (256 - 4 * difficulty)).to_bytes(32, 'big')
+
+
+def validate_difficulty(difficulty):
+    """Check a configured BLOCKCHAIN_DIFFICULTY (0 to MAX_DIFFICULTY); called at startup, not per block."""
+    if not isinstance(difficulty, int) or not 0 <= difficulty <= MAX_DIFFICULTY:
+        raise ValueError(f"BLOCKCHAIN_DIFFICULTY must be an integer between 0 and {MAX_DIFFICULTY}, got {difficulty!r}")
+    return difficulty
+
+
+def meets_difficulty(block_hash, difficulty):
+    return block_hash.startswith('0' * difficulty)
+
+
+def _search(prefix, suffix, target, start, stop):
+    """Worker: first nonce in [start, stop) whose hash is below target, or None."""
+    midstate = hashlib.sha256(prefix)  # the prefix is hashed once per task, not per attempt
+    for nonce in range(start, min(stop, MAX_NONCE + 1)):
+        h = midstate.copy()
+        h.update(b'%d' % nonce + suffix)
+        if h.digest() < target:
+            return nonce
+    return None
+
+
+_pool = None
+_pool_pid = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """Per-process spawn pool (safe from threaded web workers), kept between blocks."""
+    global _pool, _pool_pid, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid() or _pool_workers != workers:
+            if _pool is not None and _pool_pid == os.getpid():
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_pid = os.getpid()
+            _pool_workers = workers
+        return _pool
+
+
+def _parallel_search(prefix, suffix, target, workers):
+    pool = _get_pool(workers)
+    in_flight = set()
+    next_start = 0
+    try:
+        while True:
+            while len(in_flight) < workers * 2 and next_start <= MAX_NONCE:
+                in_flight.add(pool.submit(_search, prefix, suffix, target, next_start, next_start + CHUNK_SIZE))
+                next_start += CHUNK_SIZE
+            if not in_flight:
+                raise ValueError("No nonce up to MAX_NONCE meets the difficulty")
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            found = [f.result() for f in done if f.result() is not None]
+            if found:
+                return min(found)
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def mine(index, previous_hash, timestamp, data, difficulty=None, workers=None):
+    """
+    Proof of work: (nonce, hash) with `difficulty` leading hex zeros.
+    - difficulty defaults to BLOCKCHAIN_DIFFICULTY; 0 keeps nonce 0 (no mining).
+    - Long searches are split into nonce ranges across MINER_WORKERS processes.
+    """
+    if difficulty is None:
+        difficulty = current_app.config.get('BLOCKCHAIN_DIFFICULTY', 0)
+    if workers is None:
+        workers = current_app.config.get('MINER_WORKERS') or os.cpu_count() or 1
+
+    prefix, suffix = split_payload(index, previous_hash, timestamp, data)
+
+    if difficulty <= 0:
+        nonce = 0
+    else:
+        target = target_for(difficulty)
+        if workers > 1 and difficulty >= PARALLEL_MIN_DIFFICULTY:
+            nonce = _parallel_search(prefix, suffix, target, workers)
+        else:
+            nonce = None
+            start = 0
+            while nonce is None:
+                if start > MAX_NONCE:
+                    raise ValueError("No nonce up to MAX_NONCE meets the difficulty")
+                nonce = _search(prefix, suffix, target, start, start + CHUNK_SIZE)
+                start += CHUNK_SIZE
+
+    return nonce, hashlib.sha256(prefix + b'%d' % nonce + suffix).hexdigest()
+
+
+def _count_hashes(prefix, suffix, seconds):
+    """Worker: how many attempts one core gets through in `seconds`."""
+    impossible = b'\x00' * 32  # no hash is below it, so every attempt runs
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        _search(prefix, suffix, impossible, count, count + 10000)
+        count += 10000
+    return count
+
+
+def _count_naive_hashes(index, previous_hash, timestamp, data, seconds):
+    """Baseline: re-encode the whole block for every attempt."""
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for nonce in range(count, count + 1000):
+            hashlib.sha256(canonical_payload(index, previous_hash, timestamp, data, nonce).encode('utf-8')).digest()
+        count += 1000
+    return count
+
+
+def benchmark(workers=None, seconds=3.0, data=None):
+    """
+    Hash rate of the miner on a sample block: pre-serialized single core,
+    all cores in parallel, and the naive re-encode-per-attempt baseline.
+    """
+    workers = workers or os.cpu_count() or 1
+    data = data or {
+        'id': 1, 'student_id': 'BENCH-0001', 'degree_name': 'BSc Computer Science',
+        'institution': 'University of Kashmir', 'year_awarded': 2025,
+        'field_of_study': 'Computer Science', 'created_at': '2025-01-01T00:00:00'
+    }
+    block = (1, '0' * 64, '2025-01-01T00:00:00', data)
+    prefix, suffix = split_payload(*block)
+
+    naive = _count_naive_hashes(*block, seconds)
+    single = _count_hashes(prefix, suffix, seconds)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        list(pool.map(int, range(workers)))  # let the workers finish starting before timing
+        started = time.perf_counter()
+        counts = list(pool.map(_count_hashes, [prefix] * workers, [suffix] * workers, [seconds] * workers))
+        elapsed = time.perf_counter() - started
+
+    total = sum(counts)
+    return {
+        'workers': workers,
+        'naive_per_sec': naive / seconds,
+        'single_core_per_sec': single / seconds,
+        'parallel_per_sec': total / elapsed,
+        'per_core_per_sec': total / elapsed / workers
+    }
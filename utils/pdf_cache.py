@@ -0,0 +1,147 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+
+_KEY_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class PdfCache:
+    """
+    Content-addressed certificate cache, keyed by block hash.
+    - Disk tier: `<hash>.pdf` files, evicted least-recently-used (by mtime,
+      touched on every hit) once the directory exceeds `max_bytes`.
+    - Memory tier: the hottest PDFs as bytes, bounded by `memory_max_bytes`.
+    A block on the chain never changes, so entries are never invalidated,
+    only evicted.
+    """
+
+    def __init__(self, directory, max_bytes, memory_max_bytes):
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.memory_max_bytes = int(memory_max_bytes)
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._disk_bytes = self._scan_size()
+
+    @staticmethod
+    def is_cacheable(key):
+        return bool(key) and bool(_KEY_RE.match(key))
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f'{key}.pdf')
+
+    def _scan_size(self):
+        return sum(e.stat().st_size for e in os.scandir(self.directory) if e.name.endswith('.pdf'))
+
+    def _remember(self, key, data):
+        if len(data) > self.memory_max_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def get(self, key):
+        """
+        Cached PDF as bytes (memory tier or a small disk entry) or an open
+        binary file (large disk entry), or None. An open file stays readable
+        even if evict() deletes it before the response is sent.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+
+        try:
+            f = open(self.path_for(key), 'rb')
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        os.utime(f.fileno())  # LRU clock for the disk tier
+        if os.fstat(f.fileno()).st_size <= self.memory_max_bytes:
+            with f:
+                data = f.read()
+            self._remember(key, data)
+            return data
+        return f
+
+    def put(self, key, rendered_path):
+        """Move a freshly rendered PDF into the cache; returns it as an open binary file."""
+        path = self.path_for(key)
+        size = os.path.getsize(rendered_path)
+        f = open(rendered_path, 'rb')  # the cached file's inode: readable whatever evict() does
+        try:
+            os.link(rendered_path, path)  # atomic: readers see the whole file or nothing
+            added = True
+        except FileExistsError:
+            added = False  # another thread or worker cached the same PDF first; its bytes are counted
+        finally:
+            os.remove(rendered_path)
+
+        if added:
+            with self._lock:
+                self._disk_bytes += size
+                over_budget = self._disk_bytes > self.max_bytes
+            if over_budget:
+                self.evict()
+        return f
+
+    def evict(self):
+        """Drop least-recently-used files until the disk tier fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pdf'):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path, entry.name[:-4]))
+
+        total = sum(e[1] for e in entries)
+        for _, size, path, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                data = self._memory.pop(key, None)
+                if data is not None:
+                    self._memory_bytes -= len(data)
+
+        with self._lock:
+            self._disk_bytes = total
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_pdf_cache():
+    """Process-wide PdfCache built from the app config."""
+    config = current_app.config
+    directory = config['PDF_CACHE_DIR']
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = PdfCache(
+                directory,
+                max_bytes=config['PDF_CACHE_MAX_BYTES'],
+                memory_max_bytes=config['PDF_CACHE_MEMORY_BYTES']
+            )
+        return cache
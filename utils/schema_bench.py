@@ -0,0 +1,155 @@
+import hashlib
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+# The hot lookups, as the controllers issue them
+BENCH_QUERIES = [
+    ('verify by hash', 'blockchain',
+     "SELECT id FROM blockchain WHERE current_hash = :hash AND approved = :yes"),
+    ('block by degree', 'blockchain',
+     "SELECT id FROM blockchain WHERE degree_id = :degree_id AND approved = :yes"),
+    ('pending page', 'blockchain',
+     "SELECT id FROM blockchain WHERE approved = :no ORDER BY timestamp DESC, id DESC LIMIT 50"),
+    ('duplicate approval check', 'approvals',
+     "SELECT id FROM approvals WHERE block_id = :block_id AND admin_id = :admin_id"),
+    ('approval count', 'approvals',
+     "SELECT COUNT(id) FROM approvals WHERE block_id = :block_id AND approval_status = :yes"),
+    ('approvals by degree', 'approvals',
+     "SELECT COUNT(id) FROM approvals WHERE degree_id = :degree_id AND approval_status = :yes"),
+    ('student degree limit', 'degrees',
+     "SELECT COUNT(id) FROM degrees WHERE student_id = :student_id AND status != 'Rejected'"),
+]
+
+ADMIN_IDS = (1, 2, 3)
+
+
+def _student_id(n):
+    return f'BENCH{n:07d}'
+
+
+def _block_hash(n):
+    return hashlib.sha256(b'%d' % n).hexdigest()
+
+
+def seed(engine, degrees, batch_size=20000):
+    """
+    Synthetic data shaped like production: two degrees per student, one
+    block per degree; 60% of blocks approved (3 approvals), 20% part-way.
+    """
+    from my_models import Admin, Student, Degree, Block, Approval
+
+    started = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(Admin.__table__.insert(), [
+            {'id': a, 'username': f'admin{a}', 'password_hash': '-', 'public_key': '-'} for a in ADMIN_IDS
+        ])
+
+        for first in range(0, degrees, batch_size):
+            ids = range(first + 1, min(first + batch_size, degrees) + 1)
+            students, degree_rows, blocks, approvals = [], [], [], []
+            for n in ids:
+                if n % 2:
+                    students.append({'id': n // 2 + 1, 'student_id': _student_id(n // 2),
+                                     'full_name': 'Bench Student', 'email': f'bench{n // 2}@example.com',
+                                     'password_hash': '-', 'created_at': started})
+                stage = n % 5  # 0-2 approved, 3 part-way, 4 untouched
+                approved = stage < 3
+                degree_rows.append({'id': n, 'student_id': _student_id((n - 1) // 2), 'degree_name': 'BSc',
+                                    'institution': 'University of Kashmir', 'year_awarded': 2020 + n % 6,
+                                    'field_of_study': 'Computer Science', 'created_at': started,
+                                    'status': 'Approved' if approved else 'Pending'})
+                blocks.append({'id': n, 'previous_hash': _block_hash(n - 1), 'current_hash': _block_hash(n),
+                               'degree_id': n, 'timestamp': started + timedelta(seconds=n),
+                               'nonce': 0, 'approved': approved})
+                for admin_id in ADMIN_IDS[:3 if approved else (n % 2 + 1 if stage == 3 else 0)]:
+                    approvals.append({'block_id': n, 'admin_id': admin_id, 'degree_id': n,
+                                      'approval_status': True, 'approved_at': started, 'status': 'approved'})
+
+            conn.execute(Student.__table__.insert(), students)
+            conn.execute(Degree.__table__.insert(), degree_rows)
+            conn.execute(Block.__table__.insert(), blocks)
+            if approvals:
+                conn.execute(Approval.__table__.insert(), approvals)
+
+
+def _explain(conn, sql, params):
+    """The database's plan for one query, one line per plan row."""
+    if conn.dialect.name == 'sqlite':
+        return [row[-1] for row in conn.execute(text('EXPLAIN QUERY PLAN ' + sql), params)]
+    if conn.dialect.name == 'postgresql':
+        return [row[0] for row in conn.execute(text('EXPLAIN ' + sql), params)]
+    return []
+
+
+def _measure(engine, degrees, repeat, rng):
+    results = {}
+    with engine.connect() as conn:
+        for name, _, sql in BENCH_QUERIES:
+            samples = []
+            for _ in range(repeat):
+                n = rng.randint(1, degrees)
+                samples.append({'hash': _block_hash(n), 'degree_id': n, 'block_id': n,
+                                'admin_id': rng.choice(ADMIN_IDS), 'student_id': _student_id((n - 1) // 2),
+                                'yes': True, 'no': False})
+            needed = [k for k in samples[0] if ':' + k in sql]
+            samples = [{k: s[k] for k in needed} for s in samples]
+
+            plan = _explain(conn, sql, samples[0])
+            started = time.perf_counter()
+            for params in samples:
+                conn.execute(text(sql), params).fetchall()
+            elapsed = time.perf_counter() - started
+            results[name] = {'ms': elapsed * 1000 / repeat, 'plan': plan}
+    return results
+
+
+def run_schema_benchmark(database_url, degrees=1_000_000, repeat=20, seed_value=42):
+    """
+    Seed a scratch database and time the hot lookups before and after the migrations.
+    Every table at `database_url` is dropped first. The baseline runs with the
+    migration-1 indexes removed (the schema as it was); run_migrations() then
+    rebuilds them exactly as it would on a live database.
+    """
+    from my_models import db, run_migrations
+    from my_models.migrations import HOT_LOOKUP_INDEXES, schema_migrations
+
+    engine = create_engine(database_url)
+    try:
+        db.metadata.drop_all(engine)
+        db.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for name, _, _, _ in HOT_LOOKUP_INDEXES:
+                conn.execute(text(f'DROP INDEX {name}'))
+            conn.execute(schema_migrations.delete())
+
+        started = time.perf_counter()
+        seed(engine, degrees)
+        seed_seconds = time.perf_counter() - started
+        with engine.begin() as conn:
+            if conn.dialect.name in ('sqlite', 'postgresql'):
+                conn.execute(text('ANALYZE'))
+
+        before = _measure(engine, degrees, repeat, random.Random(seed_value))
+        started = time.perf_counter()
+        run_migrations(engine)
+        migrate_seconds = time.perf_counter() - started
+        with engine.begin() as conn:
+            if conn.dialect.name in ('sqlite', 'postgresql'):
+                conn.execute(text('ANALYZE'))
+        after = _measure(engine, degrees, repeat, random.Random(seed_value))
+    finally:
+        engine.dispose()
+
+    return {
+        'degrees': degrees,
+        'dialect': engine.dialect.name,
+        'seed_seconds': seed_seconds,
+        'migrate_seconds': migrate_seconds,
+        'queries': [
+            {'name': name, 'table': table, 'before': before[name], 'after': after[name]}
+            for name, table, _ in BENCH_QUERIES
+        ]
+    }
@@ -1,14 +1,18 @@
 import os
-from flask import render_template, request, redirect, url_for, session, jsonify, flash, send_file, Blueprint
-from my_models import db, Student, Degree, Block, Admin, Approval
+from flask import render_template, request, redirect, url_for, session, jsonify, flash, send_file, Blueprint, current_app, Response, make_response
+from my_models import db, Student, Degree, Block, Admin, Approval, read_replica
 from controllers.admin_controller import AdminController
 from controllers.student_controller import StudentController 
 from controllers.degree_controller import DegreeController
 from controllers.blockchain_controller import BlockchainController
+from utils.degree_import import detect_format, parse_degree_rows
+from utils.chain_writer import notify_chain_writer
+from utils.certificate_pdf import certificate_fields_bulk, default_logo_path, get_certificate_pdf
+from utils.certificate_export import EXPORT_FILTERS, export_filename, iter_certificate_zip
+from utils.http_cache import block_response, page_response, uncached_response
+from utils.entity_cache import entity_cache_stats
 from datetime import datetime
-import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
+from sqlalchemy.exc import IntegrityError
 
 
 routes = Blueprint('routes', __name__)
@@ -54,19 +58,20 @@ def init_routes(app):
         if 'admin_id' not in session:
             return redirect(url_for('admin_login'))
         
-        pending_blocks = AdminController.get_pending_approvals()
-        admin_approvals = AdminController.get_admin_approvals(session['admin_id'])
-        approved_block_ids = [a.block_id for a in admin_approvals if a.approval_status]
+        page = request.args.get('page', 1, type=int)
+        per_page = min(request.args.get('per_page', 50, type=int), 200)
+        data = AdminController.get_dashboard_data(session['admin_id'], page=page, per_page=per_page)
+        stuck_appends = BlockchainController.get_stuck_chain_appends()
 
-        pending_student_ids = list({block.degree.student_id for block in pending_blocks})
-        pending_students = Student.query.filter(Student.student_id.in_(pending_student_ids)).all()
-        
         return render_template(
             'admin/dashboard.html',
-            pending_blocks=pending_blocks,
-            admin_approvals=admin_approvals,
-            approved_block_ids=approved_block_ids,
-            pending_students=pending_students
+            pending_blocks=data['pending_blocks'],
+            pagination=data['pagination'],
+            students=data['students'],
+            approval_counts=data['approval_counts'],
+            approved_block_ids=data['approved_block_ids'],
+            pending_students=list(data['students'].values()),
+            stuck_appends=stuck_appends
         )
 
     @app.route('/admin/approve/<int:block_id>', methods=['POST'])
@@ -80,6 +85,78 @@ def init_routes(app):
         except Exception as e:
             return jsonify({'success': False, 'message': str(e)}), 500
 
+    @app.route('/admin/approve/batch', methods=['POST'])
+    def approve_blocks():
+        if 'admin_id' not in session:
+            return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+        payload = request.get_json(silent=True) or {}
+        if not isinstance(payload, dict):
+            return jsonify({'success': False, 'message': 'Request body must be a JSON object'}), 400
+        block_ids = payload.get('block_ids') or request.form.getlist('block_ids')
+        if not isinstance(block_ids, list):
+            return jsonify({'success': False, 'message': 'block_ids must be a list'}), 400
+        try:
+            block_ids = [int(b) for b in block_ids]
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'message': 'block_ids must be integers'}), 400
+
+        try:
+            success, result = BlockchainController.approve_blocks(block_ids, session['admin_id'])
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'success': False, 'message': str(e)}), 500
+
+        if not success:
+            return jsonify({'success': False, 'message': result}), 400
+        return jsonify({'success': True, 'results': {str(k): v for k, v in result.items()}})
+
+    @app.route('/admin/degrees/import', methods=['POST'])
+    def import_degrees():
+        """Bulk import degrees from an uploaded CSV or JSON-lines file"""
+        if 'admin_id' not in session:
+            return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            return jsonify({'success': False, 'message': 'No file uploaded'}), 400
+
+        fmt = request.form.get('format') or detect_format(upload.filename)
+        if fmt not in ('csv', 'jsonl'):
+            return jsonify({'success': False, 'message': f'Unsupported format: {fmt}'}), 400
+
+        success, result = DegreeController.bulk_import(
+            parse_degree_rows(upload.stream, fmt),
+            batch_size=current_app.config['BULK_IMPORT_BATCH_SIZE']
+        )
+        if not success:
+            return jsonify({'success': False, 'message': result}), 400
+        return jsonify({'success': True, **result})
+
+    @app.route('/admin/certificates/export')
+    def export_certificates():
+        """Stream a ZIP of certificate PDFs for a cohort (institution / year_awarded / field_of_study)"""
+        if 'admin_id' not in session:
+            return redirect(url_for('admin_login'))
+
+        filters = {key: request.args.get(key, '').strip() or None for key in EXPORT_FILTERS}
+        try:
+            degrees = DegreeController.get_approved_degrees(**filters)
+        except ValueError:
+            flash('year_awarded must be a number', 'error')
+            return redirect(url_for('admin_dashboard'))
+        if not degrees:
+            flash('No approved certificates match this filter.', 'warning')
+            return redirect(url_for('admin_dashboard'))
+
+        # DB work happens here; the generator below only renders + zips
+        field_sets = certificate_fields_bulk(degrees)
+        return Response(
+            iter_certificate_zip(field_sets, default_logo_path(), current_app.config['CERT_EXPORT_WORKERS']),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename="{export_filename(filters)}"'}
+        )
+
     @app.route('/student/add', methods=['GET', 'POST'])
     def add_student():
         if request.method == 'POST':
@@ -147,6 +224,7 @@ def init_routes(app):
 
         return render_template('student/add_degree.html')
     @app.route('/degree/<int:degree_id>')
+    @read_replica
     def view_degree(degree_id):
         success, degree, block = DegreeController.get_degree_with_blockchain(degree_id)
         if not success:
@@ -164,7 +242,8 @@ def init_routes(app):
             approvals=approvals
         )
 
-    @app.route('/verify', methods=['GET', 'POST']) 
+    @app.route('/verify', methods=['GET', 'POST'])
+    @read_replica
     def verify_degree():
         if request.method == 'POST':
             identifier = request.form.get('degree_id', '').strip()
@@ -172,20 +251,152 @@ def init_routes(app):
 
             if success:
                 flash("Degree verified successfully!", 'success')
-                return render_template('public/verify.html', verification_result=result, verified=True)
+                # Redirect to the shareable GET page for this credential
+                return redirect(url_for('verify_degree_result', identifier=identifier))
             else:
                 flash(result, 'error')
                 return redirect(url_for('home'))
 
         return render_template('public/verify.html')
 
+    @app.route('/verify/<identifier>')
+    @read_replica
+    def verify_degree_result(identifier):
+        """Shareable verification page; revalidated by ETag on every view."""
+        success, result = BlockchainController.verify_degree(identifier.strip())
+        if not success:
+            flash(result, 'error')
+            return uncached_response(redirect(url_for('home')))
+
+        return page_response(
+            result['verification_hash'],
+            lambda: render_template('public/verify.html', verification_result=result, verified=True)
+        )
+
+    @app.route('/api/verify/<identifier>')
+    @read_replica
+    def api_verify_degree(identifier):
+        """Single verification as JSON; safe for CDNs and vendors to cache."""
+        success, results = BlockchainController.verify_degrees([identifier])
+        if not success:
+            return uncached_response(jsonify({'success': False, 'message': results})), 503
+
+        item = results[0]
+        if not item['verified']:
+            status_code = 404 if item['status'] == 'not_found' else 409
+            response = jsonify({'success': False, 'status': item['status'], 'message': item['message']})
+            return uncached_response(response, no_store=status_code == 409), status_code
+
+        return block_response(
+            item['result']['verification_hash'],
+            lambda: jsonify({'success': True, 'result': item['result']})
+        )
+
+    @app.route('/api/verify', methods=['POST'])
+    @read_replica
+    def api_verify_degrees():
+        """
+        JSON batch verification for background-check vendors.
+        Body: {"identifiers": [hash or degree id, ...]} (at most VERIFY_BATCH_LIMIT),
+        plus "proofs": true for Merkle inclusion proofs.
+        """
+        payload = request.get_json(silent=True) or {}
+        identifiers = payload.get('identifiers') if isinstance(payload, dict) else None
+        if not isinstance(identifiers, list) or not identifiers:
+            return jsonify({'success': False, 'message': 'identifiers must be a non-empty list'}), 400
+
+        limit = current_app.config['VERIFY_BATCH_LIMIT']
+        if len(identifiers) > limit:
+            return jsonify({'success': False, 'message': f'At most {limit} identifiers per request'}), 400
+
+        success, result = BlockchainController.verify_degrees(identifiers, with_proofs=bool(payload.get('proofs')))
+        if not success:
+            return jsonify({'success': False, 'message': result}), 503
+        return jsonify({
+            'success': True,
+            'verified': sum(1 for r in result if r['verified']),
+            'results': result
+        })
+
+
+    @app.route('/api/verify/<identifier>/proof')
+    @read_replica
+    def api_inclusion_proof(identifier):
+        """
+        Merkle inclusion proof for one block, checkable offline with
+        utils.merkle.verify_inclusion against the published root.
+        ?leaf_count=N proves against the older root over the first N blocks.
+        """
+        leaf_count = request.args.get('leaf_count', type=int)
+        success, result = BlockchainController.get_inclusion_proof(identifier.strip(), leaf_count=leaf_count)
+        if not success:
+            return uncached_response(jsonify({'success': False, 'message': result})), 404
+
+        render = lambda: jsonify({'success': True, 'proof': result})
+        if leaf_count is not None:
+            # a proof against a fixed root never changes
+            return block_response(result['root'], render)
+        response = render()
+        response.set_etag(result['root'])
+        return uncached_response(response).make_conditional(request)
+
+    @app.route('/api/merkle/root')
+    @read_replica
+    def api_merkle_root():
+        """The published root: commits to every block hash on the chain."""
+        success, result = BlockchainController.get_merkle_root()
+        if not success:
+            return uncached_response(jsonify({'success': False, 'message': result})), 503
+
+        response = jsonify({'success': True, **result})
+        if result['root']:
+            response.set_etag(result['root'])
+        return uncached_response(response).make_conditional(request)
 
     @app.route('/blockchain')
+    @read_replica
     def view_blockchain():
-        blockchain = BlockchainController.get_blockchain()
-        blocks = BlockchainController.get_blockchain_blocks()
-        print("DEBUG blockchain data:", blockchain)
-        return render_template('public/blockchain.html', blockchain=blockchain, blocks=blocks)
+        after = request.args.get('after', type=int)
+        before = request.args.get('before', type=int)
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+        page = BlockchainController.get_blockchain_page(after=after, before=before, limit=limit)
+        return render_template(
+            'public/blockchain.html',
+            blockchain=page['blocks'],
+            total_blocks=page['total'],
+            prev_before=page['prev_before'],
+            next_after=page['next_after'],
+            limit=limit
+        )
+
+    @app.route('/blockchain/export.jsonl')
+    @read_replica
+    def export_blockchain():
+        """
+        The whole chain as JSON lines, exactly as stored (canonical payload +
+        hash), for auditors. Streamed from a snapshot of the chain storage, so
+        memory use does not grow with the chain.
+        """
+        reader = BlockchainController.get_chain_snapshot()
+        return Response(
+            reader.iter_lines(),
+            mimetype='application/x-ndjson',
+            headers={'Content-Disposition': 'attachment; filename="blockchain.jsonl"'}
+        )
+
+    @app.route('/blockchain/<block_hash>')
+    @read_replica
+    def view_block(block_hash):
+        success, result = BlockchainController.get_chain_block(block_hash.strip())
+        if not success:
+            flash(result, 'error')
+            return uncached_response(redirect(url_for('view_blockchain')))
+
+        render = lambda: render_template('public/block.html', **result)
+        if not result['valid']:
+            return uncached_response(make_response(render()), no_store=True)
+        return page_response(block_hash, render)
 
     @app.route('/admin/approval/<int:block_id>')
     def approval_details(block_id):
@@ -244,78 +455,80 @@ def init_routes(app):
         )
 
         db.session.add(new_approval)
+        try:
+            db.session.flush()  # the unique (block, admin) index catches a concurrent double submit
+        except IntegrityError as e:
+            db.session.rollback()
+            if not Approval.is_duplicate_error(e):
+                raise
+            flash('You have already submitted an approval for this degree', 'warning')
+            return redirect(url_for('approval_details', block_id=block_id))
 
-        approval_count = Approval.query.filter_by(
-            block_id=block_id,
-            approval_status=True
-        ).count()
-
-        if approval_count == 3:
+        # Atomic increment: of two admins approving at once, only one sees 3
+        if approval_status and \
+                BlockchainController.count_approval(block_id) == BlockchainController.REQUIRED_APPROVALS:
             block.approved = True
             degree = Degree.query.get(block.degree_id)
             if degree:
                 degree.status = 'Approved'
                 db.session.add(degree)
-                db.session.add(block)  
-                db.session.commit() 
-            BlockchainController._add_to_json_blockchain(block)
-            flash('Degree has been fully approved and added to the blockchain!', 'success')
+            # Appended by the chain writer, as is (this page never checked linkage); this request only commits the approval
+            BlockchainController._queue_chain_appends([block], check_linkage=False)
+            db.session.commit()
+            notify_chain_writer()
+            flash('Degree has been fully approved and queued for the blockchain!', 'success')
         else:
             db.session.commit()    
             flash('Your approval has been recorded', 'success')
 
         return redirect(url_for('approval_details', block_id=block_id))
 
+    @app.route('/admin/approval/<int:block_id>/chain-status')
+    def chain_append_status(block_id):
+        if 'admin_id' not in session:
+            return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+        success, result = BlockchainController.get_chain_append_status(block_id)
+        if not success:
+            return jsonify({'success': False, 'message': result}), 404
+        return jsonify({'success': True, **result})
+
+    @app.route('/admin/cache/stats')
+    def cache_stats():
+        """Admin/Student lookup cache counters for the worker that serves this request."""
+        if 'admin_id' not in session:
+            return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+        return jsonify({'success': True, 'pid': os.getpid(), 'caches': entity_cache_stats()})
+
     @app.route('/download_certificate/<int:degree_id>')
     def download_certificate(degree_id):
         # Ensure the student is logged in
         if 'student_id' not in session:
             flash('You must be logged in to download your certificate.', 'warning')
-            return redirect(url_for('student_login'))
+            return redirect(url_for('student.login_student'))
 
         degree = Degree.query.get(degree_id)
         if not degree:
             flash('Degree not found', 'danger')
-            return redirect(url_for('student_dashboard'))
+            return redirect(url_for('student.dashboard'))
 
          # Ensure the degree belongs to the logged-in student
         if degree.student_id != session['student_id']:
             flash('Unauthorized access to this certificate.', 'danger')
-            return redirect(url_for('student_dashboard'))
+            return redirect(url_for('student.dashboard'))
 
         if degree.status != 'Approved':
             flash('Certificate not generated yet. Degree is not approved.', 'warning')
-            return redirect(url_for('student_dashboard'))
-
-        student = Student.query.filter_by(student_id=degree.student_id).first()
-        if not student:
-            flash('Student details not found', 'danger')
-            return redirect(url_for('student_dashboard'))
-
-        # Generate the in-memory PDF
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
-        p.setFont("Helvetica", 18)
-        p.drawString(100, 700, "University of Kashmir Main Campus")
-        p.setFont("Helvetica", 14)
-        p.drawString(100, 660, "Degree Certificate")
-        p.drawString(100, 630, f"Student Name: {student.name}")
-        p.drawString(100, 610, f"Student ID: {student.student_id}")
-        p.drawString(100, 590, f"Degree Name: {degree.degree_name}")
-        p.drawString(100, 570, f"Year Awarded: {degree.year_awarded}")
-        p.drawString(100, 550, f"Field of Study: {degree.field_of_study}")
-        p.drawString(100, 530, f"Institution: {degree.institution}")
-        p.drawString(100, 500, f"Status: {degree.status}")
-        p.showPage()
-        p.save()
-        buffer.seek(0)
+            return redirect(url_for('student.dashboard'))
 
+        # Same template and block-hash cache as the student dashboard download
+        pdf = get_certificate_pdf(degree)
         return send_file(
-            buffer,
+            pdf,
             as_attachment=True,
             download_name=f"certificate_{degree_id}.pdf",
             mimetype='application/pdf'
-    )
+        )
 
     @app.context_processor
     def inject_now():